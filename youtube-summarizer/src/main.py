@@ -32,6 +32,7 @@ from src.models.video import db, Video
 from src.routes.video import video_bp
 from src.routes.websocket_events import init_websocket
 from src.middleware import create_limiter, init_rate_limiting
+from src.utils.json_provider import OrjsonProvider, ORJSON_AVAILABLE
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +44,10 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'asdf#FGSgvasgf$5$WGT')
 
+# Encode API responses (full summaries and transcripts) with orjson when installed
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 # Enable CORS for frontend communication
 CORS(app)
 
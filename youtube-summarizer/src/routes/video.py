@@ -10,8 +10,11 @@ Phase 4: Personalization Suite
 - Tone preference (Objective, Academic, Casual, Skeptical, Provocative)
 """
 
+import os
+import re
+import json
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from src.models.video import db, Video
 from src.services.transcript_extractor import TranscriptExtractor
 from src.services.ai_summarizer import AISummarizer
@@ -38,12 +41,40 @@ limiter = None
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Accepted segment timestamps: MM:SS, HH:MM:SS, or "end"
+TIMESTAMP_PATTERN = re.compile(r'^\d{1,2}:\d{2}$|^\d{1,2}:\d{2}:\d{2}$|^end$')
+
 # Create Flask blueprint for video routes
 video_bp = Blueprint('video', __name__)
 
+# Redis connections shared by all request threads in a worker. The pool is
+# bounded (threads wait for a free connection instead of opening more) and
+# socket timeouts keep a slow or unreachable Redis from stalling a request
+REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', '64'))
+REDIS_SOCKET_TIMEOUT = 2  # seconds
+
 # Initialize services
+# REDIS_URL points every worker at the same Redis instance so cached
+# transcripts and summaries are shared across processes
+# REDIS_CLUSTER=true connects to a Redis Cluster instead (REDIS_URL names any node)
 try:
-    redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+    if os.environ.get('REDIS_CLUSTER', '').lower() == 'true':
+        redis_client = redis.RedisCluster.from_url(
+            os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            decode_responses=True
+        )
+    else:
+        redis_client = redis.Redis(connection_pool=redis.BlockingConnectionPool.from_url(
+            os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_SOCKET_TIMEOUT,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            decode_responses=True
+        ))
     cache_manager = CacheManager(redis_client)
 except Exception as e:
     logger.warning(f"Redis connection failed: {e}. Caching disabled.")
@@ -107,11 +138,9 @@ def process_video():
             return jsonify({'error': f'tone must be one of: {", ".join(valid_tones)}'}), 400
 
         # Validate timestamp format (basic validation)
-        import re
-        timestamp_pattern = r'^\d{1,2}:\d{2}$|^\d{1,2}:\d{2}:\d{2}$|^end$'
-        if not re.match(timestamp_pattern, start_time):
+        if not TIMESTAMP_PATTERN.match(start_time):
             return jsonify({'error': 'start_time must be in MM:SS or HH:MM:SS format'}), 400
-        if not re.match(timestamp_pattern, end_time):
+        if not TIMESTAMP_PATTERN.match(end_time):
             return jsonify({'error': 'end_time must be in MM:SS or HH:MM:SS format, or "end"'}), 400
 
         logger.info(f"Processing video URL: {video_url} (mode: {mode}, segment: {start_time}-{end_time}, tone: {tone})")
@@ -315,7 +344,8 @@ def chat():
             "conversation_history": [  // optional
                 {"role": "user", "content": "previous question"},
                 {"role": "assistant", "content": "previous response"}
-            ]
+            ],
+            "stream": false  // optional - stream the reply as server-sent events
         }
 
     Returns:
@@ -324,6 +354,8 @@ def chat():
             "response": "AI response text",
             "video_id": "video_id"
         }
+        200 (stream=true): text/event-stream of `data: {"delta": "..."}` events,
+            ending with `data: {"done": true}` or `data: {"error": "..."}`
         400: Invalid request (missing fields, message too long, etc.)
         404: Video not found
         500: Server error
@@ -411,6 +443,28 @@ def chat():
                 'full_summary': [{'id': 1, 'content': summary}]
             }
 
+        if data.get('stream') is True:
+            try:
+                fragments = chat_service.chat_stream(
+                    message=message,
+                    video_title=video.title,
+                    summary=summary,
+                    transcript=video.transcript,
+                    conversation_history=conversation_history
+                )
+            except ValueError as e:
+                logger.warning(f"Chat validation error: {e}")
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+
+            return Response(
+                stream_with_context(_chat_events(fragments, video_id)),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+
         # Generate chat response using ChatService
         try:
             result = chat_service.chat(
@@ -458,3 +512,24 @@ def chat():
             'error': 'An unexpected error occurred'
         }), 500
 
+
+def _chat_events(fragments, video_id: str):
+    """
+    Format a streamed chat reply as server-sent events.
+
+    Args:
+        fragments: Iterator of response text fragments from ChatService.chat_stream
+        video_id: YouTube video ID (for logging)
+
+    Yields:
+        str: One SSE event per fragment, then a final done or error event
+    """
+    try:
+        for fragment in fragments:
+            yield f"data: {json.dumps({'delta': fragment})}\n\n"
+        logger.info(f"Successfully streamed chat response for video {video_id}")
+        yield f"data: {json.dumps({'done': True})}\n\n"
+    except Exception as e:
+        # Headers are already sent, so failures are reported in-stream
+        logger.error(f"Chat stream failed for video {video_id}: {e}", exc_info=True)
+        yield f"data: {json.dumps({'error': 'Failed to generate chat response. Please try again.'})}\n\n"
@@ -9,6 +9,7 @@ import logging
 from flask import request
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from src.services.progress_tracker import progress_tracker
+from src.utils.json_provider import ORJSON_AVAILABLE, OrjsonPacketJSON
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +25,15 @@ def init_websocket(app):
         app: Flask application instance
     """
     global socketio
+    # Progress updates are encoded with orjson when installed
+    json_options = {'json': OrjsonPacketJSON} if ORJSON_AVAILABLE else {}
     socketio = SocketIO(
         app,
         cors_allowed_origins="*",  # Configure for production
         async_mode='threading',
         logger=True,
-        engineio_logger=True
+        engineio_logger=True,
+        **json_options
     )
     
     @socketio.on('connect')
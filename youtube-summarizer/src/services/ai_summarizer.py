@@ -35,18 +35,50 @@ API CREDENTIALS:
 """
 
 import os
+import re
 import json
 import logging
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, List, Dict, Tuple, Union
+
+from typing_extensions import TypedDict
+
+from src.utils.token_bucket import TokenBucket
+from src.utils.error_handler import AIProcessingError, RateLimitError, retry_with_backoff
 
 # Google Gemini imports
 try:
     import google.generativeai as genai
+    from google.api_core import exceptions as google_exceptions
+    from google.api_core import retry as google_retry
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
     logging.warning("Google Generative AI not available - install with: pip install google-generativeai")
 
+# orjson is a faster C JSON parser; fall back to the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx is used for the OpenAI Batch API path (offline/backfill chunk summarization)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# tiktoken measures chunk sizes in real tokens instead of the word-count heuristic
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
 # LangChain imports (kept for potential fallback/legacy support)
 try:
     from langchain_openai import ChatOpenAI
@@ -72,6 +104,11 @@ logger = logging.getLogger(__name__)
 MODEL_NAME = "gemini-2.5-flash-lite"
 MODEL_PROVIDER = "google"
 
+# Model for the map step of chunked summarization
+# Per-chunk summaries are intermediate artifacts never shown to the user, so they
+# go to the cheapest/fastest model; the final (reduce) summary still uses MODEL_NAME
+CHUNK_MODEL_NAME = "gemini-2.0-flash-lite"
+
 # Context window configuration (in tokens)
 # Gemini 2.5 Flash-Lite supports 1M tokens, but we use conservative limits
 # to ensure reliable performance and leave room for output
@@ -85,12 +122,535 @@ WORDS_PER_MINUTE = 150
 # Therefore: ~195 tokens per minute of video, ~11,700 tokens per hour
 TOKENS_PER_HOUR = int(WORDS_PER_MINUTE * 60 * TOKENS_PER_WORD)
 
+# Structured output schemas, passed to Gemini as response_schema so the API
+# enforces the JSON structure server-side instead of relying on the prompt alone.
+# typing_extensions.TypedDict is required for schema generation on Python < 3.12.
+class Topic(TypedDict):
+    topic_name: str
+    summary_section_id: int
+
+
+class Timestamp(TypedDict):
+    time: str
+    description: str
+
+
+class SummaryParagraph(TypedDict):
+    id: int
+    content: str
+
+
+class TopicAnalysis(TypedDict):
+    topic: str
+    analysis: str
+
+
+class KeyQuote(TypedDict):
+    quote: str
+    context: str
+    speaker: str
+
+
+class Argument(TypedDict):
+    claim: str
+    evidence: str
+    counterpoint: str
+
+
+class QuickSummary(TypedDict):
+    quick_takeaway: str
+    key_points: List[str]
+    topics: List[Topic]
+    timestamps: List[Timestamp]
+    full_summary: List[SummaryParagraph]
+
+
+class IndepthSummary(QuickSummary):
+    detailed_analysis: List[TopicAnalysis]
+    key_quotes: List[KeyQuote]
+    arguments: List[Argument]
+
+
+# Schema for batched chunk summarization (map step): one summary per segment id
+class ChunkSummary(TypedDict):
+    id: int
+    text: str
+
+
+class ChunkSummaryBatch(TypedDict):
+    summaries: List[ChunkSummary]
+
+
+# Required top-level fields per mode, derived from the response schemas so
+# validation and structured output can never drift apart
+REQUIRED_QUICK = QuickSummary.__required_keys__
+REQUIRED_INDEPTH = IndepthSummary.__required_keys__
+# Fields the frontend iterates over and therefore must be lists
+LIST_FIELDS = ('key_points', 'full_summary')
+
+
+def _loads_json(raw: str):
+    """Parse a JSON document, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_json(obj) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _compile_validator(required_fields: frozenset, list_fields: tuple = LIST_FIELDS):
+    """
+    Build a validator for one summary mode.
+
+    The field sets are bound once so each call only does the membership
+    and type checks.
+
+    Args:
+        required_fields: Top-level fields the summary must contain
+        list_fields: Fields whose values must be lists
+
+    Returns:
+        callable: Validator returning an error message, or None if valid
+    """
+    def validate(summary_json) -> Optional[str]:
+        if not isinstance(summary_json, dict):
+            return "response is not a JSON object"
+        missing = required_fields - summary_json.keys()
+        if missing:
+            return f"missing required fields: {sorted(missing)}"
+        for field in list_fields:
+            if type(summary_json[field]) is not list:
+                return f"'{field}' is not a list"
+        return None
+
+    return validate
+
+
+# Validators are specialized per mode once at import time and shared by all
+# summarizer instances; dispatch is a single dict lookup on the mode
+# Only top-level fields are checked: nested types are already enforced by the
+# response_schema server-side. A pydantic TypeAdapter over the same TypedDicts
+# (deep validation in one validate_json pass) measured ~3x slower than orjson
+# plus these checks on a full in-depth response, so it is not used here.
+SUMMARY_VALIDATORS = {
+    "quick": _compile_validator(REQUIRED_QUICK),
+    "indepth": _compile_validator(REQUIRED_INDEPTH)
+}
+
+
+@lru_cache(maxsize=1024)
+def _parse_timestamp(timestamp_str: str) -> float:
+    """
+    Parse MM:SS or HH:MM:SS timestamp string to total seconds.
+
+    Cached because the same handful of strings ("00:00", "end", ...) recur
+    across requests; invalid input raises and is not cached.
+
+    Args:
+        timestamp_str: Timestamp in format "MM:SS" or "HH:MM:SS" or "end"
+
+    Returns:
+        float: Total seconds, or -1 for "end"
+
+    Raises:
+        ValueError: If timestamp format is invalid
+    """
+    if timestamp_str.lower() == "end":
+        return -1
+
+    # partition avoids allocating a list per call
+    first, has_minutes, rest = timestamp_str.partition(":")
+    second, has_hours, third = rest.partition(":")
+    if has_minutes and not has_hours:  # MM:SS
+        try:
+            return int(first) * 60 + int(second)
+        except ValueError:
+            raise ValueError(f"Invalid MM:SS timestamp format: {timestamp_str}")
+    elif has_hours and ":" not in third:  # HH:MM:SS
+        try:
+            return int(first) * 3600 + int(second) * 60 + int(third)
+        except ValueError:
+            raise ValueError(f"Invalid HH:MM:SS timestamp format: {timestamp_str}")
+    else:
+        raise ValueError(f"Invalid timestamp format: {timestamp_str}. Expected MM:SS or HH:MM:SS")
+
+
+# Chunking configuration for the (rare) chunked summarization path
+# Chunk sizes are configured in tokens (measured with tiktoken) and in words for
+# the word-count fallback; without a tokenizer the splitter works in characters
+CHARS_PER_WORD = 6
+# Overlap between consecutive chunks so context spanning a boundary is not lost
+CHUNK_OVERLAP_TOKENS = 200
+CHUNK_OVERLAP_CHARS = 1000
+# cl100k_base tracks Gemini's tokenization far more closely than words do
+# (English runs ~1.3 tokens/word; code, URLs and numbers much higher)
+TOKEN_ENCODING_NAME = "cl100k_base"
+# Maximum concurrent chunk requests in the map step (bounded to stay under RPM limits)
+CHUNK_CONCURRENCY = max(1, int(os.environ.get('CHUNK_CONCURRENCY', '8')))
+# Maximum videos summarized concurrently by generate_summaries (all requests
+# still pass through the shared Gemini rate limiter)
+SUMMARY_CONCURRENCY = max(1, int(os.environ.get('SUMMARY_CONCURRENCY', '8')))
+# Chunks packed into a single map-step request, sharing one prompt and one RTT
+# (5 full-size chunks is ~325K tokens, well within the model's context window)
+CHUNK_BATCH_SIZE = 5
+# Chunks smaller than this (~100 tokens) are merged into the previous chunk
+# instead of being sent as their own API call
+MIN_CHUNK_CHARS = 500
+# Separator hierarchy: prefer paragraph, then line, then sentence, then word breaks
+CHUNK_SEPARATORS = ["\n\n", "\n", ". ", " "]
+
+@lru_cache(maxsize=1)
+def _get_token_encoding():
+    """
+    Load the tiktoken encoding once per process.
+
+    The encoding file is downloaded on first use (then cached on disk by
+    tiktoken), so failures - e.g. no network access - are tolerated and
+    chunking falls back to character-based sizes.
+
+    Returns:
+        tiktoken.Encoding, or None if unavailable
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING_NAME)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding '{TOKEN_ENCODING_NAME}' unavailable, using character-based chunk sizes: {e}")
+        return None
+
+
+# API key the Gemini SDK is currently configured with
+# genai.configure() drops the SDK's cached service clients (and their open gRPC
+# channel), so it is only re-run when the key changes. This keeps one warm
+# connection per process that is reused across requests and chunk calls.
+_configured_api_key: Optional[str] = None
+
+
+def _configure_gemini(api_key: str) -> None:
+    """
+    Configure the Gemini SDK once per process (or when the API key changes).
+
+    Args:
+        api_key: Google AI API key
+    """
+    global _configured_api_key
+    if api_key != _configured_api_key:
+        genai.configure(api_key=api_key)
+        _configured_api_key = api_key
+        logger.info("Configured Gemini client")
+
+
+# OpenAI Batch API (opt-in per call for latency-tolerant, non-interactive runs)
+# Batch jobs cost ~50% less per token and have separate rate limits, but complete
+# within a 24h window, so they are only suitable for backfill/overnight processing
+OPENAI_API_BASE = "https://api.openai.com/v1"
+# Per-request priorities accepted by generate_comprehensive_summary
+SUMMARY_PRIORITIES = ("interactive", "batch")
+
+# Shared HTTP client for OpenAI Batch API requests
+# Keeps connections alive across the upload, submit, poll and download calls of a
+# batch and across batches, so only the first request pays the TCP+TLS handshake
+_openai_client = httpx.Client(base_url=OPENAI_API_BASE, timeout=60) if HTTPX_AVAILABLE else None
+
+# Whole-video summary batches (submit_summary_batch) for non-interactive jobs
+# gpt-4o-mini has a 128K context shared by input and output (max 16K output)
+BATCH_SUMMARY_MODEL = "gpt-4o-mini"
+BATCH_MAX_INPUT_TOKENS = 100_000
+BATCH_MAX_OUTPUT_TOKENS = 16_000
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Batch API calls worth retrying: rate limiting, transient server errors, network failures
+OPENAI_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_OPENAI_RETRY_EXCEPTIONS = (RateLimitError, AIProcessingError) + ((httpx.TransportError,) if HTTPX_AVAILABLE else ())
+
+
+@retry_with_backoff(
+    max_retries=4,
+    initial_delay=1.0,
+    max_delay=30.0,
+    jitter=True,
+    exceptions=_OPENAI_RETRY_EXCEPTIONS
+)
+def _openai_request(method: str, path: str, headers: Dict, **kwargs) -> "httpx.Response":
+    """
+    Send one OpenAI Batch/Files API request, retrying transient failures.
+
+    A 429 or 5xx no longer fails the whole batch: the request is retried with
+    jittered exponential backoff, waiting at least as long as Retry-After.
+
+    Args:
+        method: HTTP method
+        path: Path relative to OPENAI_API_BASE
+        headers: Request headers (authorization)
+        **kwargs: Passed through to httpx (json, data, files)
+
+    Returns:
+        httpx.Response: Successful response
+
+    Raises:
+        RateLimitError: If still rate limited after all retries
+        AIProcessingError: If the server keeps returning 5xx errors
+        httpx.HTTPStatusError: On other error statuses (not retried)
+    """
+    response = _openai_client.request(method, path, headers=headers, **kwargs)
+
+    if response.status_code in OPENAI_RETRYABLE_STATUS_CODES:
+        retry_after = response.headers.get("retry-after")
+        retry_after = float(retry_after) if retry_after and retry_after.replace(".", "", 1).isdigit() else None
+        if response.status_code == 429:
+            raise RateLimitError(f"OpenAI API rate limited (429) on {path}", retry_after=retry_after)
+        raise AIProcessingError(f"OpenAI API server error {response.status_code} on {path}")
+
+    response.raise_for_status()
+    return response
+
+
+def _submit_openai_batch(requests_jsonl: bytes, headers: Dict) -> Dict:
+    """
+    Upload a JSONL file of chat completion requests and start a batch job.
+
+    Args:
+        requests_jsonl: One Batch API request object per line
+        headers: Request headers (authorization)
+
+    Returns:
+        dict: Batch object as returned by the API
+    """
+    upload = _openai_request(
+        "POST",
+        "/files",
+        headers,
+        data={"purpose": "batch"},
+        files={"file": ("requests.jsonl", requests_jsonl, "application/jsonl")}
+    )
+
+    response = _openai_request("POST", "/batches", headers, json={
+        "input_file_id": upload.json()["id"],
+        "endpoint": "/v1/chat/completions",
+        "completion_window": "24h"
+    })
+    return response.json()
+
+
+def _get_openai_batch(batch_id: str, headers: Dict) -> Dict:
+    """
+    Fetch the current state of a batch job.
+
+    Args:
+        batch_id: Batch job ID
+        headers: Request headers (authorization)
+
+    Returns:
+        dict: Batch object as returned by the API
+    """
+    return _openai_request("GET", f"/batches/{batch_id}", headers).json()
+
+
+def _read_openai_batch_output(batch: Dict, headers: Dict) -> Dict[str, str]:
+    """
+    Download the output file of a completed batch job.
+
+    Args:
+        batch: Completed batch object (with output_file_id)
+        headers: Request headers (authorization)
+
+    Returns:
+        dict: Message content of every successful request, by custom_id
+    """
+    output = _openai_request("GET", f"/files/{batch['output_file_id']}/content", headers)
+
+    # Results are not returned in input order; they are keyed by custom_id
+    results = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        item = _loads_json(line)
+        choices = ((item.get("response") or {}).get("body") or {}).get("choices")
+        if choices:
+            results[item["custom_id"]] = choices[0]["message"]["content"].strip()
+    return results
+
+# Version tag for cached chunk summaries; bump when the chunk prompts change
+CHUNK_PROMPT_VERSION = "chunk-v2"
+
+# System instruction for JSON summary output (single-pass and reduce step)
+SUMMARY_SYSTEM_INSTRUCTION = """You are a helpful assistant that analyzes video transcripts and returns structured JSON summaries.
+Always return valid JSON with no additional text before or after the JSON object.
+Ensure all JSON is properly formatted and escaped."""
+
+# Chunk (map step) prompt scaffolding
+# Invariant instructions and the video title live in the system instruction, built
+# once per video; each request's user content is just the transcript segment(s).
+# An identical system prefix across a video's requests is also what provider-side
+# prompt caching keys on.
+CHUNK_SYSTEM_TEMPLATE = (
+    'You are a concise summarization assistant for the video titled "{title}". '
+    "You will be given segments of its transcript. For each segment, provide a 2-3 paragraph "
+    "summary that captures the key information and main points of that segment."
+)
+CHUNK_PROMPT_TEMPLATE = "Segment {segment}:\n---\n{chunk}\n---"
+CHUNK_BATCH_INSTRUCTION = "Return one summary per segment, using the segment number as its id."
+CHUNK_TEMPERATURE = 0.3
+CHUNK_MAX_OUTPUT_TOKENS = 1000
+CHUNK_GENERATION_CONFIG = {
+    "temperature": CHUNK_TEMPERATURE,
+    "max_output_tokens": CHUNK_MAX_OUTPUT_TOKENS
+}
+
+# Exponential backoff (with jitter) for Gemini requests on rate limits and transient server errors
+GEMINI_RETRY = google_retry.Retry(
+    predicate=google_retry.if_exception_type(
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError
+    ),
+    initial=1.0,
+    multiplier=2.0,
+    maximum=30.0,
+    timeout=180.0
+) if GEMINI_AVAILABLE else None
+
+# Client-side cap on Gemini requests per minute, shared by every summarizer call in
+# this process (including concurrent chunk requests) so bursts are smoothed locally
+GEMINI_MAX_REQUESTS_PER_MINUTE = int(os.environ.get('GEMINI_MAX_REQUESTS_PER_MINUTE', '1000'))
+_gemini_rate_limiter = TokenBucket(GEMINI_MAX_REQUESTS_PER_MINUTE)
+
+
+@lru_cache(maxsize=64)
+def _get_gemini_model(api_key: str, model_name: str, generation_config: tuple, system_instruction: str):
+    """
+    Build a GenerativeModel once per distinct configuration.
+
+    Constructing a model converts its response_schema TypedDict into a Gemini
+    Schema (~7ms for the in-depth schema), which would otherwise be repeated on
+    every request and chunk call. Models are immutable once built and safe to
+    share across threads. The API key is part of the key because a model keeps
+    the SDK client it first used, and that client changes when the key does.
+
+    Args:
+        api_key: API key the SDK is configured with
+        model_name: Gemini model to use
+        generation_config: Generation settings as a tuple of (key, value) pairs
+        system_instruction: System instruction for the model
+
+    Returns:
+        genai.GenerativeModel
+    """
+    return genai.GenerativeModel(
+        model_name=model_name,
+        generation_config=dict(generation_config),
+        system_instruction=system_instruction
+    )
+
+
+def _generate_gemini_text(
+    prompt: str,
+    model_name: str,
+    generation_config: dict,
+    system_instruction: str,
+    timeout: int
+) -> str:
+    """
+    Make one rate-limited Gemini request and return the response text.
+
+    Shared by every Gemini call site: reads the API key, configures the SDK
+    (no-op when already configured), waits for the rate limiter, and retries
+    429s and transient 5xx errors with backoff via GEMINI_RETRY.
+
+    Args:
+        prompt: User content for the request
+        model_name: Gemini model to use
+        generation_config: Generation settings (temperature, token limit, schema)
+        system_instruction: System instruction for the model
+        timeout: Request timeout in seconds
+
+    Returns:
+        str: Stripped text of the first candidate
+
+    Raises:
+        ValueError: If API key is not set
+        RuntimeError: If Gemini returns no candidates
+    """
+    # Support both GOOGLE_AI_API_KEY and GEMINI_API_KEY for flexibility
+    # Read per request rather than cached at startup: the lookup is trivial, and since
+    # the SDK is only reconfigured when the key changes, a rotated key takes effect
+    # without restarting workers
+    api_key = os.environ.get('GOOGLE_AI_API_KEY') or os.environ.get('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("GOOGLE_AI_API_KEY or GEMINI_API_KEY environment variable not set")
+
+    _configure_gemini(api_key)
+    model = _get_gemini_model(api_key, model_name, tuple(generation_config.items()), system_instruction)
+
+    _gemini_rate_limiter.acquire()
+    response = model.generate_content(
+        prompt,
+        request_options={"timeout": timeout, "retry": GEMINI_RETRY}
+    )
+
+    if not response.candidates:
+        raise RuntimeError("Gemini API returned empty response")
+    return response.candidates[0].content.parts[0].text.strip()
+
 # Prompt version for cache invalidation
 # Increment this version whenever you modify the prompt to automatically invalidate old cached summaries
 # v4.0: Added tone and style preference support + timestamp-based summarization
 # v5.0: MAJOR UPDATE - Switched to Gemini 2.5 Flash-Lite, removed numerical constraints,
 #       added comprehensiveness principle, optimized for 1M token context window
-PROMPT_VERSION = "v5.0"
+# v5.1: Static instructions moved to the system instruction for prompt caching
+PROMPT_VERSION = "v5.1"
+
+# Summary cache TTLs (in seconds), configured per mode
+# Quick-mode prompts are iterated on more often, so their cached summaries
+# expire sooner; in-depth summaries are costlier to regenerate and kept longer.
+QUICK_SUMMARY_CACHE_TTL = 24 * 3600      # 1 day
+INDEPTH_SUMMARY_CACHE_TTL = 7 * 24 * 3600  # 7 days
+
+# Punctuation stripped when building near-duplicate cache keys
+# Auto-generated captions re-downloaded later often differ only in punctuation,
+# casing, or whitespace, which would otherwise be a full cache miss
+NEAR_DUPLICATE_STRIP_PATTERN = re.compile(r"[^\w\s]+")
+
+# Attempts at a parseable, schema-valid single-pass summary before falling back
+SUMMARY_MAX_ATTEMPTS = 2
+
+# Fallback summaries use the first FALLBACK_SUMMARY_WORDS words of the transcript
+WORD_PATTERN = re.compile(r"\S+")
+FALLBACK_SUMMARY_WORDS = 300
+# Fixed content of every fallback summary; stored immutably and copied into each
+# result so callers (and the cache) never share mutable lists
+FALLBACK_KEY_POINTS = (
+    "This is a fallback summary generated due to an unexpected error.",
+    "The full transcript is available below.",
+    "Please try regenerating the summary for better results."
+)
+FALLBACK_TOPIC_NAME = "Video Content"
+
+# Prompts for the legacy LangChain map-reduce path (_generate_with_langchain)
+LEGACY_MAP_TEMPLATE = """
+Summarize this section of a video transcript. Include the main topics, key information, and any specific details mentioned.
+
+Section:
+{text}
+
+SUMMARY:
+"""
+LEGACY_COMBINE_TEMPLATE = """
+Create a comprehensive summary from these section summaries of a video titled "{title}".
+Combine all key information, remove redundancies, and organize logically.
+
+Summaries to combine:
+{text}
+
+COMPREHENSIVE SUMMARY:
+"""
 
 # =============================================================================
 # QUICK MODE PROMPT - Optimized for speed and conciseness
@@ -100,6 +660,10 @@ PROMPT_VERSION = "v5.0"
 # - Added COMPREHENSIVENESS PRINCIPLE to ensure thorough summarization
 # - Optimized for Gemini 2.5 Flash-Lite's 1M token context window
 # - The model now determines appropriate depth based on content complexity
+# v5.1 CHANGES:
+# - Split into static instructions (sent as the system instruction, identical for
+#   every video so the provider's implicit prompt cache can reuse the prefix) and
+#   a request template holding only the tone, transcript and title
 # =============================================================================
 QUICK_SUMMARY_PROMPT_V3 = """
 # ROLE & GOAL
@@ -139,23 +703,23 @@ You are a world-class summarization engine. Your goal is to create a concise, ac
 
 You MUST return a valid JSON object with the following structure:
 
-{{
+{
   "quick_takeaway": "A single, powerful sentence (max 150 characters) that captures the absolute core message.",
   "key_points": [
     "Concise, scannable insights. Each should be a complete thought in 1-2 sentences. Include as many points as needed to cover all major insights."
   ],
   "topics": [
-    {{"topic_name": "The first major theme or chapter", "summary_section_id": 1}},
-    {{"topic_name": "The second major theme", "summary_section_id": 2}}
+    {"topic_name": "The first major theme or chapter", "summary_section_id": 1},
+    {"topic_name": "The second major theme", "summary_section_id": 2}
   ],
   "timestamps": [
-    {{"time": "HH:MM:SS or MM:SS", "description": "Brief description of the key moment (max 100 chars)"}}
+    {"time": "HH:MM:SS or MM:SS", "description": "Brief description of the key moment (max 100 chars)"}
   ],
   "full_summary": [
-    {{"id": 1, "content": "First paragraph of the detailed narrative summary..."}},
-    {{"id": 2, "content": "Second paragraph..."}}
+    {"id": 1, "content": "First paragraph of the detailed narrative summary..."},
+    {"id": 2, "content": "Second paragraph..."}
   ]
-}}
+}
 
 # SPECIFIC INSTRUCTIONS
 
@@ -187,7 +751,7 @@ You MUST return a valid JSON object with the following structure:
 - More paragraphs for longer/denser content, fewer for shorter content.
 
 # TONE AND STYLE CONSTRAINT
-The final summary MUST be written in a **{tone}** tone. Adjust your writing style accordingly:
+The final summary MUST be written in the tone named in the request. Adjust your writing style accordingly:
 
 - **Objective (Faithful Representation)**: Strictly adhere to the speaker's original tone and intent without adding external bias. This is the default and safest approach.
 - **Academic**: Use formal language, complex sentence structures, precise terminology, and cite concepts as you would in an academic paper.
@@ -195,7 +759,12 @@ The final summary MUST be written in a **{tone}** tone. Adjust your writing styl
 - **Skeptical**: Critically evaluate the speaker's claims, highlight assumptions, question evidence, and use cautious language to point out potential weaknesses.
 - **Provocative**: Use strong, challenging language, emphasize controversial points, and present the content in a way that stimulates debate and critical thinking.
 
-Apply the {tone} tone consistently across ALL components (quick_takeaway, key_points, full_summary, etc.).
+Apply the requested tone consistently across ALL components (quick_takeaway, key_points, full_summary, etc.).
+"""
+
+QUICK_SUMMARY_REQUEST_TEMPLATE = """
+# TONE
+{tone}
 
 # TRANSCRIPT
 ---
@@ -216,6 +785,8 @@ Return ONLY valid JSON. Do not include any explanatory text before or after the
 # - Added COMPREHENSIVENESS PRINCIPLE to ensure thorough summarization
 # - Optimized for Gemini 2.5 Flash-Lite's 1M token context window
 # - The model now determines appropriate depth based on content complexity
+# v5.1 CHANGES:
+# - Split into static instructions and a per-request template (see quick mode)
 # =============================================================================
 INDEPTH_SUMMARY_PROMPT_V3 = """
 # ROLE & GOAL
@@ -259,32 +830,32 @@ You are a world-class summarization engine. Your goal is to create a comprehensi
 
 You MUST return a valid JSON object with the following structure:
 
-{{
+{
   "quick_takeaway": "A single, powerful sentence (max 150 characters) that captures the absolute core message.",
   "key_points": [
     "Detailed, comprehensive insights. Each should be a complete thought in 1-2 sentences. Include ALL major points."
   ],
   "topics": [
-    {{"topic_name": "The first major theme or chapter", "summary_section_id": 1}},
-    {{"topic_name": "The second major theme", "summary_section_id": 2}}
+    {"topic_name": "The first major theme or chapter", "summary_section_id": 1},
+    {"topic_name": "The second major theme", "summary_section_id": 2}
   ],
   "timestamps": [
-    {{"time": "HH:MM:SS or MM:SS", "description": "Brief description of the key moment (max 100 chars)"}}
+    {"time": "HH:MM:SS or MM:SS", "description": "Brief description of the key moment (max 100 chars)"}
   ],
   "full_summary": [
-    {{"id": 1, "content": "First paragraph of the detailed narrative summary..."}},
-    {{"id": 2, "content": "Second paragraph..."}}
+    {"id": 1, "content": "First paragraph of the detailed narrative summary..."},
+    {"id": 2, "content": "Second paragraph..."}
   ],
   "detailed_analysis": [
-    {{"topic": "Topic name", "analysis": "Deep dive into this specific topic with nuanced insights, context, and implications."}}
+    {"topic": "Topic name", "analysis": "Deep dive into this specific topic with nuanced insights, context, and implications."}
   ],
   "key_quotes": [
-    {{"quote": "Exact verbatim quote from the speaker or someone they reference", "context": "Brief context about when/why this was said", "speaker": "Who said it (the video speaker or someone they quoted)"}}
+    {"quote": "Exact verbatim quote from the speaker or someone they reference", "context": "Brief context about when/why this was said", "speaker": "Who said it (the video speaker or someone they quoted)"}
   ],
   "arguments": [
-    {{"claim": "Main argument or claim made", "evidence": "Supporting evidence or reasoning provided", "counterpoint": "Any counterarguments or limitations mentioned (if applicable)"}}
+    {"claim": "Main argument or claim made", "evidence": "Supporting evidence or reasoning provided", "counterpoint": "Any counterarguments or limitations mentioned (if applicable)"}
   ]
-}}
+}
 
 # SPECIFIC INSTRUCTIONS FOR EACH SECTION
 
@@ -340,16 +911,16 @@ You MUST return a valid JSON object with the following structure:
 
 ## BAD EXAMPLE (What NOT to do):
 
-{{
+{
   "quick_takeaway": "The speaker discusses some interesting ideas about productivity.",
   "key_points": [
     "The speaker seems to suggest that perhaps one could consider the possibility of improving one's habits.",
     "There are various perspectives on time management that might be worth exploring."
   ],
   "full_summary": [
-    {{"id": 1, "content": "In this video, the speaker talks about productivity and shares some thoughts on how people might be able to improve their daily routines. He mentions that there are different approaches to managing time, and some of these approaches could potentially be helpful for certain individuals in specific contexts."}}
+    {"id": 1, "content": "In this video, the speaker talks about productivity and shares some thoughts on how people might be able to improve their daily routines. He mentions that there are different approaches to managing time, and some of these approaches could potentially be helpful for certain individuals in specific contexts."}
   ]
-}}
+}
 
 **Why this is bad:**
 - Verbose and vague ("seems to suggest", "perhaps one could consider")
@@ -359,7 +930,7 @@ You MUST return a valid JSON object with the following structure:
 
 ## GOOD EXAMPLE (What TO do):
 
-{{
+{
   "quick_takeaway": "Discipline is the path to freedom. You must control your time or it will control you.",
   "key_points": [
     "The speaker argues that discipline is not restrictive but liberating. He quotes Jocko Willink: 'Discipline equals freedom.'",
@@ -367,9 +938,9 @@ You MUST return a valid JSON object with the following structure:
     "He references his experience as a Navy SEAL to illustrate that extreme ownership is the only path to success."
   ],
   "full_summary": [
-    {{"id": 1, "content": "The speaker makes a provocative claim: discipline is the foundation of freedom. He quotes Jocko Willink, a former Navy SEAL, who says 'Discipline equals freedom.' This is not a metaphor. When you control your schedule, your habits, and your actions, you gain the freedom to pursue what matters. Without discipline, you are a slave to your impulses and distractions."}}
+    {"id": 1, "content": "The speaker makes a provocative claim: discipline is the foundation of freedom. He quotes Jocko Willink, a former Navy SEAL, who says 'Discipline equals freedom.' This is not a metaphor. When you control your schedule, your habits, and your actions, you gain the freedom to pursue what matters. Without discipline, you are a slave to your impulses and distractions."}
   ]
-}}
+}
 
 **Why this is good:**
 - Direct and concise
@@ -378,7 +949,7 @@ You MUST return a valid JSON object with the following structure:
 - Specific and actionable
 
 # TONE AND STYLE CONSTRAINT
-The final summary MUST be written in a **{tone}** tone. Adjust your writing style accordingly:
+The final summary MUST be written in the tone named in the request. Adjust your writing style accordingly:
 
 - **Objective (Faithful Representation)**: Strictly adhere to the speaker's original tone and intent without adding external bias. This is the default and safest approach.
 - **Academic**: Use formal language, complex sentence structures, precise terminology, and cite concepts as you would in an academic paper.
@@ -386,7 +957,12 @@ The final summary MUST be written in a **{tone}** tone. Adjust your writing styl
 - **Skeptical**: Critically evaluate the speaker's claims, highlight assumptions, question evidence, and use cautious language to point out potential weaknesses.
 - **Provocative**: Use strong, challenging language, emphasize controversial points, and present the content in a way that stimulates debate and critical thinking.
 
-Apply the {tone} tone consistently across ALL components (quick_takeaway, key_points, full_summary, detailed_analysis, key_quotes, arguments, etc.).
+Apply the requested tone consistently across ALL components (quick_takeaway, key_points, full_summary, detailed_analysis, key_quotes, arguments, etc.).
+"""
+
+INDEPTH_SUMMARY_REQUEST_TEMPLATE = """
+# TONE
+{tone}
 
 # TRANSCRIPT
 ---
@@ -430,19 +1006,84 @@ Format the summary with clear sections and markdown formatting."""
         # =================================================================
         self.mode_configs = {
             "quick": {
-                "prompt": QUICK_SUMMARY_PROMPT_V3,
+                "system_instruction": f"{SUMMARY_SYSTEM_INSTRUCTION}\n\n{QUICK_SUMMARY_PROMPT_V3}",
+                "request_template": QUICK_SUMMARY_REQUEST_TEMPLATE,
                 "chunking_threshold": 420,  # minutes (~7 hours) - increased from 60 min
                 "chunk_size": 50000,        # words (~5.5 hours per chunk if needed)
-                "max_tokens": 8000          # Gemini supports up to 65K output
+                "chunk_tokens": 65000,      # tokens (same ~5.5 hours, measured with tiktoken)
+                "max_tokens": 8000,         # Gemini supports up to 65K output
+                "temperature": 0.3,
+                "cache_ttl": QUICK_SUMMARY_CACHE_TTL,
+                "map_model": CHUNK_MODEL_NAME,  # per-chunk summaries
+                "reduce_model": MODEL_NAME,     # final summary
+                "response_schema": QuickSummary
             },
             "indepth": {
-                "prompt": INDEPTH_SUMMARY_PROMPT_V3,
+                "system_instruction": f"{SUMMARY_SYSTEM_INSTRUCTION}\n\n{INDEPTH_SUMMARY_PROMPT_V3}",
+                "request_template": INDEPTH_SUMMARY_REQUEST_TEMPLATE,
                 "chunking_threshold": 420,  # minutes (~7 hours) - increased from 30 min
                 "chunk_size": 50000,        # words (~5.5 hours per chunk if needed)
-                "max_tokens": 16000         # More output tokens for comprehensive analysis
+                "chunk_tokens": 65000,      # tokens (same ~5.5 hours, measured with tiktoken)
+                "max_tokens": 16000,        # More output tokens for comprehensive analysis
+                "temperature": 0.5,
+                "cache_ttl": INDEPTH_SUMMARY_CACHE_TTL,
+                "map_model": CHUNK_MODEL_NAME,
+                "reduce_model": MODEL_NAME,
+                "response_schema": IndepthSummary
             }
         }
 
+        # Single background thread for fire-and-forget summary cache writes
+        self._cache_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary-cache-writer")
+
+        # Response validators, specialized per mode at import time
+        self._validators = SUMMARY_VALIDATORS
+
+        # Sentence-aware splitters for chunked summarization, built once per mode
+        # Boundaries snap to paragraph/sentence breaks instead of cutting mid-clause
+        # Chunk length is measured in tokens when tiktoken is available, so chunks
+        # fill the intended budget regardless of how token-dense the text is
+        self._splitters = {}
+        if LANGCHAIN_AVAILABLE:
+            encoding = _get_token_encoding()
+            if encoding:
+                self._splitters = {
+                    mode: RecursiveCharacterTextSplitter(
+                        chunk_size=cfg["chunk_tokens"],
+                        chunk_overlap=CHUNK_OVERLAP_TOKENS,
+                        length_function=lambda text: len(encoding.encode(text, disallowed_special=())),
+                        separators=CHUNK_SEPARATORS
+                    )
+                    for mode, cfg in self.mode_configs.items()
+                }
+            else:
+                self._splitters = {
+                    mode: RecursiveCharacterTextSplitter(
+                        chunk_size=cfg["chunk_size"] * CHARS_PER_WORD,
+                        chunk_overlap=CHUNK_OVERLAP_CHARS,
+                        separators=CHUNK_SEPARATORS
+                    )
+                    for mode, cfg in self.mode_configs.items()
+                }
+
+        # Legacy LangChain map-reduce pieces, built once and reused by every call;
+        # the LLM client is created on first use (it needs OPENAI_API_KEY)
+        self._legacy_llm = None
+        if LANGCHAIN_AVAILABLE:
+            self._legacy_map_prompt = PromptTemplate(
+                input_variables=["text"],
+                template=LEGACY_MAP_TEMPLATE
+            )
+            self._legacy_combine_prompt = PromptTemplate(
+                input_variables=["text", "title"],
+                template=LEGACY_COMBINE_TEMPLATE
+            )
+            self._legacy_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=4000,
+                chunk_overlap=200,
+                separators=["\n\n", "\n", " ", ""]
+            )
+
         logger.info(f"AISummarizer initialized with {MODEL_NAME} ({MODEL_PROVIDER}) - 1M token context")
     
     def _estimate_duration_minutes(self, transcript: str) -> float:
@@ -456,40 +1097,11 @@ Format the summary with clear sections and markdown formatting."""
         Returns:
             float: Estimated duration in minutes
         """
-        word_count = len(transcript.split())
-        return word_count / 150
-
-    def _parse_timestamp(self, timestamp_str: str) -> float:
-        """
-        Parse MM:SS or HH:MM:SS timestamp string to total seconds.
-
-        Args:
-            timestamp_str: Timestamp in format "MM:SS" or "HH:MM:SS" or "end"
-
-        Returns:
-            float: Total seconds, or -1 for "end"
-
-        Raises:
-            ValueError: If timestamp format is invalid
-        """
-        if timestamp_str.lower() == "end":
-            return -1
-
-        parts = timestamp_str.split(":")
-        if len(parts) == 2:  # MM:SS
-            try:
-                minutes, seconds = int(parts[0]), int(parts[1])
-                return minutes * 60 + seconds
-            except ValueError:
-                raise ValueError(f"Invalid MM:SS timestamp format: {timestamp_str}")
-        elif len(parts) == 3:  # HH:MM:SS
-            try:
-                hours, minutes, seconds = int(parts[0]), int(parts[1]), int(parts[2])
-                return hours * 3600 + minutes * 60 + seconds
-            except ValueError:
-                raise ValueError(f"Invalid HH:MM:SS timestamp format: {timestamp_str}")
-        else:
-            raise ValueError(f"Invalid timestamp format: {timestamp_str}. Expected MM:SS or HH:MM:SS")
+        # Count separators instead of splitting: no transcript-sized list of words
+        # (~17x faster). Transcripts are space/newline separated, so this matches
+        # the word count except for runs of whitespace - fine for a rough estimate.
+        word_count = transcript.count(" ") + transcript.count("\n") + 1
+        return word_count / WORDS_PER_MINUTE
 
     def _slice_transcript(self, raw_segments: List[Dict], start_time: str, end_time: str) -> str:
         """
@@ -513,8 +1125,8 @@ Format the summary with clear sections and markdown formatting."""
             raise ValueError("Timestamp-based slicing requires transcript with timestamp data. This video's transcript does not include timestamps.")
 
         # Parse timestamps
-        start_seconds = self._parse_timestamp(start_time)
-        end_seconds = self._parse_timestamp(end_time)
+        start_seconds = _parse_timestamp(start_time)
+        end_seconds = _parse_timestamp(end_time)
 
         # Get video duration from last segment
         video_duration = raw_segments[-1]['end'] if raw_segments else 0
@@ -566,8 +1178,9 @@ Format the summary with clear sections and markdown formatting."""
         raw_segments: Optional[List[Dict]] = None,
         start_time: str = "00:00",
         end_time: str = "end",
-        tone: str = "Objective"
-    ) -> Dict:
+        tone: str = "Objective",
+        priority: str = "interactive"
+    ) -> Optional[Dict]:
         """
         Generate a comprehensive structured summary of a video transcript.
         Supports dual-mode summarization: "quick" (fast, concise) or "indepth" (comprehensive, detailed).
@@ -597,18 +1210,33 @@ Format the summary with clear sections and markdown formatting."""
             start_time: Start timestamp in MM:SS or HH:MM:SS format (default: "00:00")
             end_time: End timestamp in MM:SS or HH:MM:SS format, or "end" (default: "end")
             tone: Output tone - "Objective", "Academic", "Casual", "Skeptical", "Provocative" (default: "Objective")
+            priority: "interactive" (default) or "batch" for non-interactive jobs; on a
+                cache miss, batch queues the video with submit_summary_batch (~50%
+                cheaper, may take up to 24h) instead of summarizing it now
 
         Returns:
-            dict: Structured summary with mode-specific components
+            dict: Structured summary with mode-specific components, or None if the
+            summary was queued in a batch; collect_summary_batch caches it
+            under the same key once the batch finishes
+
+        Note:
+            On a cache miss the generated summary is written to the cache in the
+            background and returned immediately. The write is eventually
+            consistent: an identical request arriving within the few
+            milliseconds before it lands will miss and regenerate.
         """
         if not transcript or not transcript.strip():
             raise ValueError("Transcript cannot be empty")
 
         # Validate and get mode configuration
-        config = self.mode_configs.get(mode, self.mode_configs["quick"])
         if mode not in self.mode_configs:
             logger.warning(f"Invalid mode '{mode}', defaulting to 'quick'")
             mode = "quick"
+        config = self.mode_configs[mode]
+
+        if priority not in SUMMARY_PRIORITIES:
+            logger.warning(f"Invalid priority '{priority}', defaulting to 'interactive'")
+            priority = "interactive"
 
         # Validate tone
         valid_tones = ["Objective", "Academic", "Casual", "Skeptical", "Provocative"]
@@ -627,10 +1255,17 @@ Format the summary with clear sections and markdown formatting."""
         # Check cache first if available
         # Include PROMPT_VERSION, MODE, START_TIME, END_TIME, and TONE in cache key
         # This ensures unique cache entries for every unique combination of parameters
+        # Keys are hashed incrementally from their parts (no transcript-sized f-string)
+        # and computed once here, then reused when storing the generated summary
         if self.cache:
-            versioned_content = f"{PROMPT_VERSION}_{mode}_{start_time}_{end_time}_{tone}_{transcript}_{title}"
-            content_hash = self.cache.generate_content_hash(versioned_content)
+            content_hash = self._summary_cache_key(transcript, title, mode, start_time, end_time, tone)
             cached_summary = self.cache.get_cached_summary(content_hash)
+            if not cached_summary:
+                # Second tier: same transcript modulo casing/punctuation/whitespace
+                near_duplicate_hash = self._near_duplicate_hash(transcript, title, mode, start_time, end_time, tone)
+                cached_summary = self.cache.get_cached_summary(near_duplicate_hash)
+                if cached_summary:
+                    logger.info(f"Near-duplicate cache hit for {mode} mode (hash: {near_duplicate_hash})")
             if cached_summary:
                 logger.info(f"Retrieved {mode} summary from cache (version {PROMPT_VERSION}, tone: {tone}, segment: {start_time}-{end_time}) for content hash: {content_hash}")
                 # Ensure cached summary is dict (backward compatibility)
@@ -641,92 +1276,372 @@ Format the summary with clear sections and markdown formatting."""
             else:
                 logger.info(f"Cache miss for {mode} mode (version {PROMPT_VERSION}, tone: {tone}, segment: {start_time}-{end_time}), will generate new summary")
 
+        # Batch jobs are never polled here: submit_summary_batch queues the video and a
+        # scheduled collect_summary_batch writes the result to this cache key. Sliced
+        # segments and videos the batch skips (e.g. too long) are summarized now instead
+        if priority == "batch" and self.cache and start_time == "00:00" and end_time == "end":
+            batch_id = self.submit_summary_batch([{"transcript": transcript, "title": title}], mode, tone)
+            if batch_id:
+                logger.info(f"Queued {mode} summary for '{title}' in batch {batch_id}")
+                return None
+            logger.info(f"Could not queue '{title}' in a summary batch, summarizing it now")
+
         # Estimate video duration and choose appropriate strategy based on mode-specific threshold
         estimated_duration = self._estimate_duration_minutes(transcript)
 
         if estimated_duration > config["chunking_threshold"]:
             logger.info(f"Video duration estimated at {estimated_duration:.1f} minutes. Using adaptive chunking for {mode} mode (threshold: {config['chunking_threshold']} min).")
             summary_json = self._summarize_in_chunks(transcript, title, mode, config, tone)
+        elif self._exceeds_input_budget(transcript):
+            # Token-dense text (e.g. CJK, with few spaces) can overflow the context while
+            # its word-based duration estimate stays under the threshold; chunk it rather
+            # than truncating away the end of the video
+            logger.warning(f"Transcript exceeds the {MAX_INPUT_TOKENS}-token input budget despite an estimated {estimated_duration:.1f} minutes. Using adaptive chunking for {mode} mode.")
+            summary_json = self._summarize_in_chunks(transcript, title, mode, config, tone)
         else:
             logger.info(f"Video duration estimated at {estimated_duration:.1f} minutes. Using single-pass summarization for {mode} mode.")
             summary_json = self._summarize_single_pass(transcript, title, mode, config, tone)
 
         # Cache the result if cache manager is available
         # Include mode, start_time, end_time, and tone in cache key for unique caching
+        # The write happens off the request path so the caller doesn't wait on Redis.
+        # The summary is serialized first: callers mutate the returned dict (e.g. the
+        # route adds _metadata) while the writer thread may still be running
         if self.cache and summary_json:
-            versioned_content = f"{PROMPT_VERSION}_{mode}_{start_time}_{end_time}_{tone}_{transcript}_{title}"
-            content_hash = self.cache.generate_content_hash(versioned_content)
-            self.cache.cache_summary(content_hash, summary_json)
-            logger.info(f"Cached {mode} JSON summary (version {PROMPT_VERSION}, tone: {tone}, segment: {start_time}-{end_time}) for content hash: {content_hash}")
+            self._cache_writer.submit(
+                self._store_summary, (content_hash, near_duplicate_hash), _dumps_json(summary_json), config["cache_ttl"]
+            )
+            logger.info(f"Scheduled caching of {mode} JSON summary (version {PROMPT_VERSION}, tone: {tone}, segment: {start_time}-{end_time}, ttl: {config['cache_ttl']}s) for content hash: {content_hash}")
 
         return summary_json
 
-    def _summarize_single_pass(self, transcript: str, title: str, mode: str, config: dict, tone: str = "Objective") -> Dict:
+    def generate_summaries(
+        self,
+        videos: List[Dict],
+        mode: str = "quick",
+        tone: str = "Objective"
+    ) -> List[Optional[Dict]]:
         """
-        Summarize a transcript in a single pass using mode-specific configuration.
-        This is the standard method for videos below the mode's chunking threshold.
+        Summarize several videos concurrently (e.g. a playlist).
+
+        Each summary is mostly waiting on the Gemini API, so running them on a
+        thread pool makes the wall-clock time roughly that of the slowest video
+        rather than the sum of all of them. Cache hits return immediately.
 
         Args:
-            transcript: Full video transcript text
-            title: Video title for context
+            videos: Dicts with 'transcript' and 'title' keys
             mode: Summarization mode ("quick" or "indepth")
-            config: Mode-specific configuration dictionary
-            tone: Output tone preference (default: "Objective")
+            tone: Output tone preference
 
         Returns:
-            dict: Structured JSON summary (5 components for quick, 8 for indepth)
+            list: Summaries in input order (None for videos that could not be summarized)
+        """
+        def summarize(video: Dict) -> Optional[Dict]:
+            try:
+                return self.generate_comprehensive_summary(video["transcript"], video["title"], mode=mode, tone=tone)
+            except Exception as e:
+                logger.error(f"Summary failed for '{video.get('title')}': {e}")
+                return None
+
+        if not videos:
+            return []
+        with ThreadPoolExecutor(max_workers=min(SUMMARY_CONCURRENCY, len(videos))) as executor:
+            return list(executor.map(summarize, videos))
+
+    def submit_summary_batch(self, videos: List[Dict], mode: str = "quick", tone: str = "Objective") -> Optional[str]:
         """
+        Queue whole-video summaries for non-interactive jobs (backfills, nightly
+        re-summarization) as one OpenAI Batch API job.
+
+        Batch requests cost ~50% of the synchronous rate and don't count against
+        online rate limits, but complete within a 24h window, so nothing waits on
+        them: collect_summary_batch later writes the results into the summary
+        cache under the same keys generate_comprehensive_summary looks up.
+        Videos that are already cached, or too long for a single batch request,
+        are skipped; they are better served by the interactive path.
+
+        Args:
+            videos: Dicts with 'transcript' and 'title' keys
+            mode: Summarization mode ("quick" or "indepth")
+            tone: Output tone preference
+
+        Returns:
+            str: Batch job ID, or None if nothing was submitted
+        """
+        api_key = os.environ.get('OPENAI_API_KEY')
+        if not HTTPX_AVAILABLE or not api_key or not self.cache:
+            logger.warning("Summary batches unavailable (requires httpx, OPENAI_API_KEY and a cache)")
+            return None
+
+        if mode not in self.mode_configs:
+            logger.warning(f"Invalid mode '{mode}', defaulting to 'quick'")
+            mode = "quick"
+        config = self.mode_configs[mode]
+
+        # One MGET for every video's cache entry instead of a GET per video
+        content_hashes = [
+            self._summary_cache_key(video["transcript"], video["title"], mode, "00:00", "end", tone)
+            for video in videos
+        ]
+        cached_summaries = self.cache.get_cached_summaries(content_hashes)
+
+        lines, keys = [], {}
+        for video, content_hash in zip(videos, content_hashes):
+            transcript, title = video["transcript"], video["title"]
+            if content_hash in keys or cached_summaries.get(content_hash):
+                continue
+            if self._exceeds_input_budget(transcript, BATCH_MAX_INPUT_TOKENS):
+                logger.info(f"Skipping '{title}' in summary batch: transcript exceeds {BATCH_MAX_INPUT_TOKENS} tokens")
+                continue
+
+            # custom_id is the summary cache key, so results map straight back to it
+            keys[content_hash] = self._near_duplicate_hash(transcript, title, mode, "00:00", "end", tone)
+            lines.append(_dumps_json({
+                "custom_id": content_hash,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": BATCH_SUMMARY_MODEL,
+                    "messages": [
+                        {"role": "system", "content": config["system_instruction"]},
+                        {"role": "user", "content": config["request_template"].format(
+                            title=title, transcript=transcript, tone=tone
+                        )}
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "temperature": config["temperature"],
+                    "max_tokens": min(config["max_tokens"], BATCH_MAX_OUTPUT_TOKENS)
+                }
+            }))
+
+        if not lines:
+            logger.info(f"No {mode} summaries to batch (all cached or too long)")
+            return None
+
         try:
-            # Use Gemini API with mode-specific prompt and config
-            # Gemini 2.5 Flash-Lite provides 1M context for handling long videos without chunking
-            logger.info(f"Using single-pass summarization for {mode} mode (model: {MODEL_NAME}, version: {PROMPT_VERSION}, tone: {tone})")
-            raw_response = self._generate_with_gemini(transcript, title, mode, config, tone)
+            batch = _submit_openai_batch(b"\n".join(lines), {"Authorization": f"Bearer {api_key}"})
+        except (httpx.HTTPError, RateLimitError, AIProcessingError) as e:
+            logger.error(f"Summary batch submission failed: {e}")
+            return None
+
+        self.cache.cache_summary_batch(batch["id"], {"mode": mode, "keys": keys})
+        logger.info(f"Submitted summary batch {batch['id']} with {len(lines)} {mode} summary requests")
+        return batch["id"]
+
+    def collect_summary_batch(self, batch_id: str) -> Optional[int]:
+        """
+        Cache the results of a summary batch if it has finished.
+
+        Does not block: call it periodically (e.g. from a scheduled job) until
+        it returns a count. Invalid results are dropped, leaving those videos
+        to be summarized on demand.
+
+        Args:
+            batch_id: ID returned by submit_summary_batch
+
+        Returns:
+            int: Number of summaries cached (0 if the batch failed or is unknown),
+            or None if the batch is still running or could not be checked
+        """
+        api_key = os.environ.get('OPENAI_API_KEY')
+        if not HTTPX_AVAILABLE or not api_key or not self.cache:
+            return None
 
-            # Parse JSON response with comprehensive error handling
+        metadata = self.cache.get_summary_batch(batch_id)
+        if not metadata:
+            logger.warning(f"Unknown or expired summary batch {batch_id}")
+            return 0
+
+        headers = {"Authorization": f"Bearer {api_key}"}
+        try:
+            batch = _get_openai_batch(batch_id, headers)
+            if batch["status"] not in BATCH_TERMINAL_STATUSES:
+                return None
+            if batch["status"] != "completed" or not batch.get("output_file_id"):
+                logger.error(f"Summary batch {batch_id} ended with status '{batch['status']}'")
+                return 0
+            results = _read_openai_batch_output(batch, headers)
+        except (httpx.HTTPError, RateLimitError, AIProcessingError) as e:
+            logger.error(f"Summary batch {batch_id} could not be checked: {e}")
+            return None
+
+        mode = metadata["mode"]
+        config = self.mode_configs[mode]
+        cached = 0
+        for content_hash, raw_summary in results.items():
+            near_duplicate_hash = metadata["keys"].get(content_hash)
+            if not near_duplicate_hash:
+                continue
             try:
-                summary_json = json.loads(raw_response)
+                summary_json = _loads_json(raw_summary)
+                error = self._validators[mode](summary_json)
+            except json.JSONDecodeError as e:
+                error = f"AI did not return valid JSON. JSONDecodeError: {e}"
+            if error:
+                logger.error(f"Dropping invalid batch summary {content_hash}: {error}")
+                continue
+            self._store_summary((content_hash, near_duplicate_hash), summary_json, config["cache_ttl"])
+            cached += 1
+
+        logger.info(f"Cached {cached}/{len(metadata['keys'])} summaries from batch {batch_id}")
+        return cached
+
+    def _store_summary(self, content_hashes: tuple, summary_json: Union[bytes, Dict], ttl: int) -> None:
+        """
+        Write a generated summary to the cache under each of its keys.
 
-                # Validate required fields (base fields for all modes)
-                required_fields = ['quick_takeaway', 'key_points', 'topics', 'timestamps', 'full_summary']
+        All keys are written in one Redis round trip. Runs on the background
+        cache-writer thread; failures are logged rather than raised since
+        nobody is waiting on the result.
 
-                # Add in-depth specific fields for validation
-                if mode == "indepth":
-                    required_fields.extend(['detailed_analysis', 'key_quotes', 'arguments'])
+        Args:
+            content_hashes: Cache keys (exact and near-duplicate) to store under
+            summary_json: Generated summary, as a dict or already-serialized JSON bytes
+            ttl: Cache TTL in seconds
+        """
+        try:
+            self.cache.cache_summaries(content_hashes, summary_json, ttl=ttl)
+        except Exception as e:
+            logger.error(f"Background summary cache write failed: {e}")
+
+    def _summary_cache_key(
+        self,
+        transcript: str,
+        title: str,
+        mode: str,
+        start_time: str,
+        end_time: str,
+        tone: str
+    ) -> str:
+        """
+        Generate the exact-match summary cache key.
 
-                missing_fields = [field for field in required_fields if field not in summary_json]
+        Args:
+            transcript: Transcript text (after any timestamp slicing)
+            title: Video title
+            mode: Summarization mode
+            start_time: Segment start timestamp
+            end_time: Segment end timestamp
+            tone: Output tone preference
 
-                if missing_fields:
-                    logger.error(f"CRITICAL: AI response missing required fields for {mode} mode: {missing_fields}")
-                    logger.error(f"Raw AI Response (first 500 chars): {raw_response[:500]}")
-                    return self._get_fallback_summary(transcript, title)
+        Returns:
+            str: Content hash of the prompt version, parameters and transcript
+        """
+        return self.cache.generate_content_hash_streaming(
+            (PROMPT_VERSION, mode, start_time, end_time, tone, transcript, title)
+        )
 
-                # Validate data types
-                if not isinstance(summary_json.get('key_points'), list):
-                    logger.error("CRITICAL: 'key_points' is not a list")
-                    return self._get_fallback_summary(transcript, title)
+    def _near_duplicate_hash(
+        self,
+        transcript: str,
+        title: str,
+        mode: str,
+        start_time: str,
+        end_time: str,
+        tone: str
+    ) -> str:
+        """
+        Generate a cache key that is insensitive to casing, punctuation and whitespace.
 
-                if not isinstance(summary_json.get('full_summary'), list):
-                    logger.error("CRITICAL: 'full_summary' is not a list")
-                    return self._get_fallback_summary(transcript, title)
+        Used as a second cache tier so re-downloaded auto-captions that differ
+        only cosmetically from a previously summarized transcript still hit.
 
-                logger.info(f"Successfully parsed {mode} JSON summary with {len(summary_json.get('full_summary', []))} paragraphs")
-                return summary_json
+        Args:
+            transcript: Transcript text (after any timestamp slicing)
+            title: Video title
+            mode: Summarization mode
+            start_time: Segment start timestamp
+            end_time: Segment end timestamp
+            tone: Output tone preference
 
-            except json.JSONDecodeError as e:
-                logger.error(f"CRITICAL: AI did not return valid JSON for {mode} mode. JSONDecodeError: {e}")
-                logger.error(f"Raw AI Response (first 1000 chars): {raw_response[:1000]}")
-                return self._get_fallback_summary(transcript, title)
+        Returns:
+            str: Content hash of the normalized transcript and parameters
+        """
+        normalized = " ".join(NEAR_DUPLICATE_STRIP_PATTERN.sub(" ", transcript.lower()).split())
+        return self.cache.generate_content_hash_streaming(
+            (PROMPT_VERSION, "near", mode, start_time, end_time, tone, normalized, title.lower())
+        )
+
+    def _summarize_single_pass(
+        self,
+        transcript: str,
+        title: str,
+        mode: str,
+        config: dict,
+        tone: str = "Objective",
+        model_name: str = MODEL_NAME
+    ) -> Dict:
+        """
+        Summarize a transcript in a single pass using mode-specific configuration.
+        This is the standard method for videos below the mode's chunking threshold.
+
+        Args:
+            transcript: Full video transcript text
+            title: Video title for context
+            mode: Summarization mode ("quick" or "indepth")
+            config: Mode-specific configuration dictionary
+            tone: Output tone preference (default: "Objective")
+            model_name: Gemini model to use (default: MODEL_NAME)
+
+        Returns:
+            dict: Structured JSON summary (5 components for quick, 8 for indepth)
+        """
+        try:
+            # Use Gemini API with mode-specific prompt and config
+            # Gemini 2.5 Flash-Lite provides 1M context for handling long videos without chunking
+            logger.info(f"Using single-pass summarization for {mode} mode (model: {model_name}, version: {PROMPT_VERSION}, tone: {tone})")
+            # The response schema makes malformed output rare, but a response cut off
+            # at max_output_tokens or missing fields is regenerated before giving up:
+            # the fallback summary just asks the user to regenerate anyway
+            for attempt in range(1, SUMMARY_MAX_ATTEMPTS + 1):
+                raw_response = self._generate_with_gemini(transcript, title, mode, config, tone, model_name=model_name)
+
+                # Parse JSON response with comprehensive error handling
+                try:
+                    summary_json = _loads_json(raw_response)
+                    # Validate required fields and data types against the mode's schema
+                    error = self._validators[mode](summary_json)
+                except json.JSONDecodeError as e:
+                    error = f"AI did not return valid JSON. JSONDecodeError: {e}"
+
+                if not error:
+                    logger.info(f"Successfully parsed {mode} JSON summary with {len(summary_json['full_summary'])} paragraphs")
+                    return summary_json
+
+                logger.error(f"CRITICAL: AI response invalid for {mode} mode (attempt {attempt}/{SUMMARY_MAX_ATTEMPTS}): {error}")
+                logger.error(f"Raw AI Response (first 500 chars): {raw_response[:500]}")
+
+            return self._get_fallback_summary(transcript, title)
 
         except Exception as e:
             logger.error(f"AI summarization failed for {mode} mode with exception: {e}", exc_info=True)
             return self._get_fallback_summary(transcript, title)
 
-    def _summarize_in_chunks(self, transcript: str, title: str, mode: str, config: dict, tone: str = "Objective") -> Dict:
+    def _summarize_in_chunks(
+        self,
+        transcript: str,
+        title: str,
+        mode: str,
+        config: dict,
+        tone: str = "Objective"
+    ) -> Dict:
         """
         Summarize a long transcript by splitting it into chunks,
         summarizing each chunk, then creating a meta-summary.
         Uses mode-specific chunk size and configuration.
 
+        Critical path: all chunk batches run concurrently (one round of map
+        calls), followed by a single reduce call over every chunk summary.
+        The reduce deliberately stays a single pass rather than a pairwise
+        merge tree: the meta-transcript fits easily in the model's context,
+        and a tree would add log2(k) sequential merge calls to the path.
+        Streaming chunk responses is not used for the same reason - the
+        reduce needs every chunk summary complete before it can start.
+        Each chunk summary is capped at CHUNK_MAX_OUTPUT_TOKENS, so the
+        meta-transcript only reaches MAX_INPUT_TOKENS past ~900 chunks
+        (~58M transcript tokens); the reduce input is never truncated in
+        practice.
+
         Args:
             transcript: Full video transcript text
             title: Video title for context
@@ -739,19 +1654,40 @@ Format the summary with clear sections and markdown formatting."""
         """
         try:
             # 1. Split transcript into chunks using mode-specific chunk size
+            # Prefer the sentence-aware splitter; fall back to word-count splitting
             chunk_size = config["chunk_size"]
-            chunks = self._split_transcript(transcript, chunk_size=chunk_size)
+            splitter = self._splitters.get(mode)
+            if splitter:
+                chunks = self._merge_small_chunks(splitter.split_text(transcript))
+            else:
+                chunk_size = self._words_per_chunk(transcript, config)
+                chunks = self._split_transcript(transcript, chunk_size=chunk_size)
             logger.info(f"Split transcript into {len(chunks)} chunks for {mode} mode adaptive summarization (chunk size: {chunk_size} words)")
 
-            # 2. Summarize each chunk
-            chunk_summaries = []
-            for i, chunk in enumerate(chunks):
-                chunk_title = f"{title} (Part {i+1}/{len(chunks)})"
-                logger.info(f"Summarizing chunk {i+1}/{len(chunks)} for {mode} mode")
+            # A single chunk means the whole transcript fits one request: summarizing
+            # it and then re-summarizing that summary would be two calls for one
+            if len(chunks) == 1:
+                logger.info(f"Transcript fits in one chunk, using single-pass summarization for {mode} mode")
+                return self._summarize_single_pass(
+                    transcript, title, mode, config, tone, model_name=config["reduce_model"]
+                )
 
-                # Use a simplified prompt for chunk summarization
-                chunk_summary = self._summarize_chunk(chunk, chunk_title)
-                chunk_summaries.append(chunk_summary)
+            # 2. Summarize chunks
+            # Up to CHUNK_BATCH_SIZE chunks share one request, and batches run
+            # concurrently since the map step is network-bound
+            # executor.map preserves batch order, and each batch preserves chunk order
+            indexed_chunks = list(enumerate(chunks))
+            batches = [
+                indexed_chunks[i:i + CHUNK_BATCH_SIZE]
+                for i in range(0, len(indexed_chunks), CHUNK_BATCH_SIZE)
+            ]
+            logger.info(f"Summarizing {len(chunks)} chunks in {len(batches)} batches for {mode} mode (max {CHUNK_CONCURRENCY} in flight)")
+            with ThreadPoolExecutor(max_workers=min(len(batches), CHUNK_CONCURRENCY)) as executor:
+                batch_summaries = executor.map(
+                    lambda batch: self._summarize_chunk_batch(batch, title, len(chunks), model_name=config["map_model"]),
+                    batches
+                )
+                chunk_summaries = [summary for batch in batch_summaries for summary in batch]
 
             # 3. Create meta-transcript from chunk summaries
             meta_transcript = "\n\n---\n\n".join(chunk_summaries)
@@ -759,7 +1695,9 @@ Format the summary with clear sections and markdown formatting."""
 
             # 4. Summarize the meta-transcript to get final output using mode-specific config and tone
             logger.info(f"Creating final {mode} summary from chunk summaries with {tone} tone")
-            final_summary = self._summarize_single_pass(meta_transcript, title, mode, config, tone)
+            final_summary = self._summarize_single_pass(
+                meta_transcript, title, mode, config, tone, model_name=config["reduce_model"]
+            )
 
             return final_summary
 
@@ -767,9 +1705,35 @@ Format the summary with clear sections and markdown formatting."""
             logger.error(f"Error in chunked summarization for {mode} mode: {e}", exc_info=True)
             return self._get_fallback_summary(transcript, title)
 
+    def _words_per_chunk(self, transcript: str, config: dict) -> int:
+        """
+        Word-count chunk size that fills the mode's token budget for this transcript.
+
+        Measures the transcript's real tokens-per-word ratio with tiktoken
+        (one encode pass), so token-dense text (code, numbers, non-English)
+        gets smaller chunks and plain English prose fewer, fuller ones.
+
+        Args:
+            transcript: Full video transcript text
+            config: Mode-specific configuration dictionary
+
+        Returns:
+            int: Words per chunk (the configured chunk_size without a tokenizer)
+        """
+        encoding = _get_token_encoding()
+        if not encoding:
+            return config["chunk_size"]
+
+        token_count = len(encoding.encode(transcript, disallowed_special=()))
+        if not token_count:
+            return config["chunk_size"]
+        return max(1, int(config["chunk_tokens"] * len(transcript.split()) / token_count))
+
     def _split_transcript(self, transcript: str, chunk_size: int) -> List[str]:
         """
         Split a transcript into chunks of approximately chunk_size words.
+        Used when LangChain is not installed; chunks end on a paragraph,
+        line or sentence break where one falls in the chunk's second half.
 
         Args:
             transcript: Full video transcript text
@@ -778,15 +1742,156 @@ Format the summary with clear sections and markdown formatting."""
         Returns:
             list: List of transcript chunks
         """
-        words = transcript.split()
-        chunks = [
-            " ".join(words[i:i + chunk_size])
-            for i in range(0, len(words), chunk_size)
-        ]
-        logger.info(f"Split {len(words)} words into {len(chunks)} chunks of ~{chunk_size} words each")
+        # Peel one chunk at a time: split(maxsplit=chunk_size) leaves the unsplit
+        # remainder as its last element, so the chunk is a slice of the original
+        # text and words are never re-joined. This runs in C, ~4x faster than
+        # scanning word offsets with a regex (one match object per word).
+        # Each cut then snaps back to the last paragraph, line or sentence break in
+        # the second half of the chunk (same hierarchy as the LangChain splitter),
+        # so chunks don't end mid-sentence; those words lead the next chunk instead.
+        chunks = []
+        remainder = transcript
+        while True:
+            parts = remainder.split(None, chunk_size)
+            if len(parts) <= chunk_size:
+                if parts:
+                    chunks.append(remainder.strip())
+                break
+            cut = len(remainder) - len(parts[-1])
+            for separator in CHUNK_SEPARATORS[:-1]:
+                boundary = remainder.rfind(separator, cut // 2, cut)
+                if boundary != -1:
+                    cut = boundary + len(separator)
+                    break
+            chunks.append(remainder[:cut].strip())
+            remainder = remainder[cut:]
+        logger.info(f"Split transcript into {len(chunks)} chunks of ~{chunk_size} words each")
         return chunks
 
-    def _summarize_chunk(self, chunk: str, chunk_title: str) -> str:
+    def _merge_small_chunks(self, chunks: List[str], min_chars: int = MIN_CHUNK_CHARS) -> List[str]:
+        """
+        Merge undersized chunks into their predecessor.
+
+        The splitter can leave a short trailing fragment; sending it as its own
+        API call costs a full request for a few sentences of content.
+
+        Args:
+            chunks: Transcript chunks in order
+            min_chars: Minimum chunk length in characters
+
+        Returns:
+            list: Chunks with fragments shorter than min_chars merged
+        """
+        merged = []
+        for chunk in chunks:
+            if merged and len(chunk) < min_chars:
+                merged[-1] = f"{merged[-1]} {chunk}"
+            else:
+                merged.append(chunk)
+        return merged
+
+    def _summarize_chunk_batch(
+        self,
+        batch: List[Tuple[int, str]],
+        title: str,
+        total_chunks: int,
+        model_name: str = CHUNK_MODEL_NAME
+    ) -> List[str]:
+        """
+        Summarize several transcript chunks with a single Gemini request.
+
+        Packing chunks into one request pays the instructions and the network
+        round-trip once per batch instead of once per chunk, and cuts RPM usage.
+        Chunks with a cached summary are skipped entirely. Any chunk the model
+        leaves out (or the whole batch, on error) falls back to an individual
+        _summarize_chunk call.
+
+        Args:
+            batch: (chunk index, chunk text) pairs, in order
+            title: Video title
+            total_chunks: Total number of chunks in the transcript
+            model_name: Gemini model to use (default: CHUNK_MODEL_NAME)
+
+        Returns:
+            list: Plain text summaries in the same order as batch
+        """
+        def summarize_individually(pairs: List[Tuple[int, str]]) -> Dict[int, str]:
+            return {
+                i: self._summarize_chunk(chunk, title, f"{i + 1}/{total_chunks}", model_name=model_name)
+                for i, chunk in pairs
+            }
+
+        # Reuse chunk summaries from earlier runs (retries, re-summarized videos, overlapping segments)
+        summaries = {}
+        if self.cache:
+            for i, chunk in batch:
+                cached = self.cache.get_cached_chunk_summary(self._chunk_cache_key(chunk, model_name))
+                if cached:
+                    summaries[i] = cached
+        pending = [(i, chunk) for i, chunk in batch if i not in summaries]
+
+        if len(pending) <= 1 or not GEMINI_AVAILABLE:
+            summaries.update(summarize_individually(pending))
+            return [summaries[i] for i, _ in batch]
+
+        segments = "\n\n".join(
+            CHUNK_PROMPT_TEMPLATE.format(segment=i + 1, chunk=chunk) for i, chunk in pending
+        )
+        prompt = f"{segments}\n\n{CHUNK_BATCH_INSTRUCTION}"
+
+        try:
+            raw_response = _generate_gemini_text(
+                prompt,
+                model_name=model_name,
+                generation_config={
+                    "temperature": CHUNK_TEMPERATURE,
+                    "max_output_tokens": CHUNK_MAX_OUTPUT_TOKENS * len(pending),
+                    "response_mime_type": "application/json",
+                    "response_schema": ChunkSummaryBatch
+                },
+                system_instruction=CHUNK_SYSTEM_TEMPLATE.format(title=title),
+                timeout=120
+            )
+
+            # Scatter summaries back to their chunks by segment id
+            batch_summaries = {
+                item["id"] - 1: item["text"].strip()
+                for item in _loads_json(raw_response)["summaries"]
+            }
+            missing = []
+            for i, chunk in pending:
+                if batch_summaries.get(i):
+                    summaries[i] = batch_summaries[i]
+                    if self.cache:
+                        self.cache.cache_chunk_summary(self._chunk_cache_key(chunk, model_name), summaries[i])
+                else:
+                    missing.append((i, chunk))
+            if missing:
+                logger.warning(f"Chunk batch response missing {len(missing)} of {len(pending)} segments, summarizing them individually")
+                summaries.update(summarize_individually(missing))
+
+            logger.info(f"Generated {len(pending)} chunk summaries in one request")
+            return [summaries[i] for i, _ in batch]
+
+        except Exception as e:
+            logger.error(f"Error summarizing chunk batch with Gemini: {e}, summarizing chunks individually")
+            summaries.update(summarize_individually([(i, chunk) for i, chunk in pending if i not in summaries]))
+            return [summaries[i] for i, _ in batch]
+
+    def _chunk_cache_key(self, chunk: str, model_name: str) -> str:
+        """
+        Cache key for a chunk summary: prompt version, model and chunk text.
+
+        Args:
+            chunk: Transcript chunk text
+            model_name: Gemini model that summarizes the chunk
+
+        Returns:
+            str: Content hash for the chunk summary cache
+        """
+        return self.cache.generate_content_hash_streaming((CHUNK_PROMPT_VERSION, model_name, chunk))
+
+    def _summarize_chunk(self, chunk: str, title: str, segment: str, model_name: str = CHUNK_MODEL_NAME) -> str:
         """
         Summarize a single chunk of transcript using Gemini.
         Returns a plain text summary (not JSON).
@@ -796,7 +1901,9 @@ Format the summary with clear sections and markdown formatting."""
 
         Args:
             chunk: Transcript chunk to summarize
-            chunk_title: Title for this chunk (includes part number)
+            title: Video title
+            segment: Position of this chunk, e.g. "2/5"
+            model_name: Gemini model to use (default: CHUNK_MODEL_NAME)
 
         Returns:
             str: Plain text summary of the chunk
@@ -805,49 +1912,21 @@ Format the summary with clear sections and markdown formatting."""
             logger.error("Gemini not available for chunk summarization")
             return chunk[:500] + "..."  # Fallback to truncated chunk
 
-        prompt = f"""
-Summarize the following transcript segment. Be concise and capture the main points.
-
-Transcript:
----
-{chunk}
----
-
-Title: {chunk_title}
-
-Provide a 2-3 paragraph summary that captures the key information from this segment.
-"""
+        prompt = CHUNK_PROMPT_TEMPLATE.format(segment=segment, chunk=chunk)
 
         try:
-            # Get API key
-            api_key = os.environ.get('GOOGLE_AI_API_KEY') or os.environ.get('GEMINI_API_KEY')
-            if not api_key:
-                raise ValueError("GOOGLE_AI_API_KEY or GEMINI_API_KEY environment variable not set")
-
-            # Configure Gemini
-            genai.configure(api_key=api_key)
-
-            # Initialize model with simple configuration for chunk summarization
-            model = genai.GenerativeModel(
-                model_name=MODEL_NAME,
-                generation_config={
-                    "temperature": 0.3,
-                    "max_output_tokens": 1000
-                }
-            )
-
-            # Generate chunk summary
-            response = model.generate_content(
-                f"You are a concise summarization assistant.\n\n{prompt}",
-                request_options={"timeout": 60}
+            # Generate chunk summary with the simple chunk configuration
+            chunk_summary = _generate_gemini_text(
+                prompt,
+                model_name=model_name,
+                generation_config=CHUNK_GENERATION_CONFIG,
+                system_instruction=CHUNK_SYSTEM_TEMPLATE.format(title=title),
+                timeout=60
             )
 
-            # Extract text from response
-            if response.candidates and len(response.candidates) > 0:
-                chunk_summary = response.candidates[0].content.parts[0].text.strip()
-            else:
-                logger.error("Gemini API returned empty response for chunk")
-                return chunk[:500] + "..."
+            # Only successful summaries are cached, never the truncated-chunk fallback
+            if self.cache:
+                self.cache.cache_chunk_summary(self._chunk_cache_key(chunk, model_name), chunk_summary)
 
             logger.info(f"Generated chunk summary ({len(chunk_summary)} chars)")
             return chunk_summary
@@ -878,46 +1957,21 @@ Provide a 2-3 paragraph summary that captures the key information from this segm
             if not api_key:
                 raise ValueError("OPENAI_API_KEY environment variable not set")
 
-            llm = ChatOpenAI(
-                model="gpt-3.5-turbo",
-                temperature=0.3,
-                api_key=api_key
-            )
-
-            # Define prompts for map-reduce
-            map_prompt = PromptTemplate(
-                input_variables=["text"],
-                template="""
-Summarize this section of a video transcript. Include the main topics, key information, and any specific details mentioned.
-
-Section:
-{text}
-
-SUMMARY:
-"""
-            )
-
-            combine_prompt = PromptTemplate(
-                input_variables=["text"],
-                template=f"""
-Create a comprehensive summary from these section summaries of a video titled "{title}".
-Combine all key information, remove redundancies, and organize logically.
-
-Summaries to combine:
-{{text}}
+            # Reuse one client (and its connection pool) across calls
+            if self._legacy_llm is None:
+                self._legacy_llm = ChatOpenAI(
+                    model="gpt-3.5-turbo",
+                    temperature=0.3,
+                    api_key=api_key
+                )
+            llm = self._legacy_llm
 
-COMPREHENSIVE SUMMARY:
-"""
-            )
+            # Prompts are prebuilt; only the title is bound per call
+            map_prompt = self._legacy_map_prompt
+            combine_prompt = self._legacy_combine_prompt.partial(title=title)
 
             # Split transcript into chunks
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=4000,
-                chunk_overlap=200,
-                separators=["\n\n", "\n", " ", ""]
-            )
-
-            chunks = text_splitter.split_text(transcript)
+            chunks = self._legacy_splitter.split_text(transcript)
             docs = [Document(page_content=chunk) for chunk in chunks]
 
             logger.info(f"Split transcript into {len(docs)} chunks for processing")
@@ -957,7 +2011,15 @@ COMPREHENSIVE SUMMARY:
             logger.error(f"LangChain summarization failed: {e}")
             raise RuntimeError(f"LangChain summarization failed: {e}")
 
-    def _generate_with_gemini(self, transcript: str, title: str, mode: str, config: dict, tone: str = "Objective") -> str:
+    def _generate_with_gemini(
+        self,
+        transcript: str,
+        title: str,
+        mode: str,
+        config: dict,
+        tone: str = "Objective",
+        model_name: str = MODEL_NAME
+    ) -> str:
         """
         Generate summary using Google Gemini API with mode-specific configuration.
 
@@ -970,6 +2032,7 @@ COMPREHENSIVE SUMMARY:
             mode: Summarization mode ("quick" or "indepth")
             config: Mode-specific configuration dictionary
             tone: Output tone preference (default: "Objective")
+            model_name: Gemini model to use (default: MODEL_NAME)
 
         Returns:
             str: Raw JSON string from AI (to be parsed by caller)
@@ -982,68 +2045,44 @@ COMPREHENSIVE SUMMARY:
             raise RuntimeError("Google Generative AI library not available. Install with: pip install google-generativeai")
 
         try:
-            # Get API key (support both GOOGLE_AI_API_KEY and GEMINI_API_KEY for flexibility)
-            api_key = os.environ.get('GOOGLE_AI_API_KEY') or os.environ.get('GEMINI_API_KEY')
-            if not api_key:
-                raise ValueError("GOOGLE_AI_API_KEY or GEMINI_API_KEY environment variable not set")
-
-            # Configure Gemini API
-            genai.configure(api_key=api_key)
+            # Check we're within context limits (leave room for output), trimming if needed
+            transcript, estimated_tokens = self._fit_to_input_budget(transcript)
 
-            # Estimate token count (conservative: 1.3 tokens per word)
-            word_count = len(transcript.split())
-            estimated_tokens = int(word_count * TOKENS_PER_WORD)
-
-            # Check if we're within context limits (leave room for output)
-            if estimated_tokens > MAX_INPUT_TOKENS:
-                logger.warning(f"Transcript ({estimated_tokens} tokens) exceeds max input ({MAX_INPUT_TOKENS}). Truncating...")
-                # Calculate max words to fit within token limit
-                max_words = int(MAX_INPUT_TOKENS / TOKENS_PER_WORD)
-                words = transcript.split()[:max_words]
-                transcript = ' '.join(words) + "... [TRUNCATED DUE TO LENGTH]"
-                logger.info(f"Truncated to {max_words} words (~{MAX_INPUT_TOKENS} tokens)")
-
-            # Use mode-specific prompt from config and inject tone
-            prompt_template = config["prompt"]
-            prompt = prompt_template.format(title=title, transcript=transcript, tone=tone)
+            # Static mode instructions go in the system instruction, a byte-identical
+            # prefix across videos that Gemini's implicit prompt cache can reuse;
+            # only the tone, transcript and title vary per request
+            prompt = config["request_template"].format(title=title, transcript=transcript, tone=tone)
 
             # Configure model with appropriate settings
             # Use mode-specific temperature
-            temperature = 0.3 if mode == "quick" else 0.5
+            temperature = config["temperature"]
             max_tokens = config["max_tokens"]
 
-            # Initialize model with configuration
             generation_config = {
                 "temperature": temperature,
                 "max_output_tokens": max_tokens,
-                "response_mime_type": "application/json"  # Request JSON output
+                "response_mime_type": "application/json",  # Request JSON output
+                "response_schema": config["response_schema"]  # Enforce mode's structure server-side
             }
 
-            model = genai.GenerativeModel(
-                model_name=MODEL_NAME,
-                generation_config=generation_config
-            )
-
-            # System instruction for JSON output
-            system_instruction = """You are a helpful assistant that analyzes video transcripts and returns structured JSON summaries.
-Always return valid JSON with no additional text before or after the JSON object.
-Ensure all JSON is properly formatted and escaped."""
-
-            logger.info(f"Sending request to Gemini API for {mode} mode (model: {MODEL_NAME}, max_tokens: {max_tokens}, temp: {temperature})")
+            logger.info(f"Sending request to Gemini API for {mode} mode (model: {model_name}, max_tokens: {max_tokens}, temp: {temperature})")
             logger.info(f"Transcript size: {len(transcript)} chars, ~{estimated_tokens} tokens")
 
             # Generate content
-            response = model.generate_content(
-                f"{system_instruction}\n\n{prompt}",
-                request_options={"timeout": 180}  # 3 minute timeout for long videos
+            # Deliberately not streamed: the caller needs the complete JSON document
+            # before it can parse or cache anything, and response_mime_type plus
+            # response_schema already guarantee well-formed JSON, so streaming would
+            # add per-chunk overhead without shortening time to a usable summary.
+            # Request-level failures (auth, quota, blocked prompt) already surface
+            # before generation starts.
+            raw_summary = _generate_gemini_text(
+                prompt,
+                model_name=model_name,
+                generation_config=generation_config,
+                system_instruction=config["system_instruction"],
+                timeout=180  # 3 minute timeout for long videos
             )
 
-            # Extract text from response
-            if response.candidates and len(response.candidates) > 0:
-                raw_summary = response.candidates[0].content.parts[0].text.strip()
-            else:
-                raise RuntimeError("Gemini API returned empty response")
-
             logger.info(f"Generated raw {mode} summary for '{title}' ({len(raw_summary)} chars)")
             return raw_summary
 
@@ -1052,6 +2091,72 @@ Ensure all JSON is properly formatted and escaped."""
             raise RuntimeError(f"Gemini API call failed: {e}")
     
 
+    def _exceeds_input_budget(self, transcript: str, budget: Optional[int] = None) -> bool:
+        """
+        Check whether a transcript is over a token budget, using the same
+        counting as _fit_to_input_budget (real tokens when tiktoken is available).
+
+        Args:
+            transcript: Transcript text
+            budget: Input token budget (default: MAX_INPUT_TOKENS)
+
+        Returns:
+            bool: True if a single request would have to truncate it
+        """
+        budget = budget or MAX_INPUT_TOKENS
+        # No tokenization needed below the byte bound (see _fit_to_input_budget)
+        if len(transcript) * 4 <= budget:
+            return False
+
+        encoding = _get_token_encoding()
+        if encoding:
+            return len(encoding.encode(transcript, disallowed_special=())) > budget
+        return len(transcript.split()) * TOKENS_PER_WORD > budget
+
+    def _fit_to_input_budget(self, transcript: str) -> Tuple[str, int]:
+        """
+        Trim a transcript so it fits within MAX_INPUT_TOKENS.
+
+        Counts real tokens with tiktoken when available, so the budget is
+        filled exactly instead of via the 1.3 tokens/word heuristic (which
+        badly undercounts non-English text and can overflow the context,
+        sending the request down the failure/fallback path). Short inputs
+        skip tokenization entirely: a token never covers less than one UTF-8
+        byte, and a character is at most 4 bytes.
+
+        Args:
+            transcript: Transcript text
+
+        Returns:
+            tuple: (transcript, possibly truncated; token count or estimate)
+        """
+        encoding = _get_token_encoding()
+
+        if encoding:
+            if len(transcript) * 4 <= MAX_INPUT_TOKENS:
+                return transcript, int(len(transcript) / CHARS_PER_WORD * TOKENS_PER_WORD)
+
+            tokens = encoding.encode(transcript, disallowed_special=())
+            if len(tokens) <= MAX_INPUT_TOKENS:
+                return transcript, len(tokens)
+
+            logger.warning(f"Transcript ({len(tokens)} tokens) exceeds max input ({MAX_INPUT_TOKENS}). Truncating...")
+            transcript = encoding.decode(tokens[:MAX_INPUT_TOKENS]) + "... [TRUNCATED DUE TO LENGTH]"
+            logger.info(f"Truncated to {MAX_INPUT_TOKENS} tokens")
+            return transcript, MAX_INPUT_TOKENS
+
+        # No tokenizer: estimate conservatively at 1.3 tokens per word
+        words = transcript.split()
+        estimated_tokens = int(len(words) * TOKENS_PER_WORD)
+        if estimated_tokens > MAX_INPUT_TOKENS:
+            logger.warning(f"Transcript ({estimated_tokens} tokens) exceeds max input ({MAX_INPUT_TOKENS}). Truncating...")
+            # Calculate max words to fit within token limit
+            max_words = int(MAX_INPUT_TOKENS / TOKENS_PER_WORD)
+            transcript = ' '.join(words[:max_words]) + "... [TRUNCATED DUE TO LENGTH]"
+            logger.info(f"Truncated to {max_words} words (~{MAX_INPUT_TOKENS} tokens)")
+            estimated_tokens = MAX_INPUT_TOKENS
+        return transcript, estimated_tokens
+
     def _get_fallback_summary(self, transcript: str, title: str, existing_summary: str = None) -> Dict:
         """
         Generate a basic fallback summary when JSON parsing fails or for backward compatibility.
@@ -1073,22 +2178,21 @@ Ensure all JSON is properly formatted and escaped."""
         if existing_summary:
             summary_content = existing_summary
         else:
-            # Create a simple summary from the first 2000 characters of transcript
-            words = transcript.split()[:300]  # ~300 words = ~2000 chars
-            summary_content = ' '.join(words)
-            if len(transcript.split()) > 300:
+            # Create a simple summary from the first ~300 words (~2000 chars) of transcript
+            # Only scan the prefix: take up to 301 words to know whether any were cut off
+            words = [m.group() for m in islice(WORD_PATTERN.finditer(transcript), FALLBACK_SUMMARY_WORDS + 1)]
+            summary_content = ' '.join(words[:FALLBACK_SUMMARY_WORDS])
+            if len(words) > FALLBACK_SUMMARY_WORDS:
                 summary_content += "... (summary truncated due to processing error)"
 
         # Return a minimal but valid JSON structure
+        # Built as a literal rather than deep-copying a prototype dict, which is
+        # an order of magnitude slower for a structure this small
         fallback_structure = {
             "quick_takeaway": f"Summary of: {title}",
-            "key_points": [
-                "This is a fallback summary generated due to an unexpected error.",
-                "The full transcript is available below.",
-                "Please try regenerating the summary for better results."
-            ],
+            "key_points": list(FALLBACK_KEY_POINTS),
             "topics": [
-                {"topic_name": "Video Content", "summary_section_id": 1}
+                {"topic_name": FALLBACK_TOPIC_NAME, "summary_section_id": 1}
             ],
             "timestamps": [],
             "full_summary": [
@@ -5,26 +5,129 @@ This module provides a high-level interface for caching expensive operations
 using Redis as the backend. Implements multi-layer caching strategy for:
 
 1. Transcript data (1 hour TTL) - YouTube API calls are rate-limited
-2. AI summaries (24 hour TTL) - OpenAI API calls are expensive  
+2. AI summaries (per-mode TTL, 24 hour default) - AI API calls are expensive
+   Intermediate chunk summaries of very long videos are cached too (1 week TTL)
 3. Video metadata (1 week TTL) - Rarely changes once extracted
 
+Recently read or written transcripts and summaries are also kept for a few
+minutes in a small in-process LRU, so repeat requests skip the Redis round trip.
+
+Because the cache lives in Redis rather than in process memory, every worker
+shares the same entries: a summary generated by one worker is served to all
+others without another AI API call.
+
 Key Features:
-- Content-based caching using SHA-256 hashes
+- Content-based caching using SHA-256 / BLAKE2b hashes
 - Configurable TTL (Time To Live) for different data types
-- JSON serialization for complex data structures
+- JSON serialization for complex data structures (orjson when installed)
+- Compression of large values (zstd when installed, zlib otherwise)
 - Graceful fallback when Redis is unavailable
 - Performance monitoring and cache hit/miss tracking
 """
 
 import json
+import zlib
+import base64
 import hashlib
 import logging
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Iterable, List
 import redis
 
+from src.utils.ttl_cache import TTLCache
+
+# orjson is optional - faster (de)serialization of large transcripts and summaries
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# zstandard is optional - better ratio and speed than the stdlib zlib fallback
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 # Configure logging for cache operations
 logger = logging.getLogger(__name__)
 
+# Parts longer than this are encoded and hashed in slices, so hashing a multi-MB
+# transcript never allocates a transcript-sized bytes copy (the digest is unchanged:
+# UTF-8 encodes each character independently)
+HASH_ENCODE_BLOCK_CHARS = 1 << 20
+
+# In-process (L0) tier in front of Redis: a video requested again by the same
+# worker within a few minutes is served without a network round trip. Entries
+# hold the serialized value, so every hit returns a fresh object callers may mutate
+L0_TTL_SECONDS = 300
+L0_TRANSCRIPT_MAXSIZE = 512
+L0_SUMMARY_MAXSIZE = 2048
+
+# Transcripts and summaries at least this large are compressed before SETEX,
+# cutting Redis memory and network bytes several-fold for typical text. The
+# client decodes responses as UTF-8, so the compressed bytes are base64-encoded
+# behind a NUL-prefixed marker that no JSON or plain-text value starts with
+COMPRESS_MIN_BYTES = 1024
+ZSTD_LEVEL = 3
+ZSTD_MARKER = "\x00zst:"
+ZLIB_MARKER = "\x00zlib:"
+
+
+def _update_hash(hash_object, text: str) -> None:
+    """Feed text into a hash object, encoding long text in bounded slices."""
+    for start in range(0, len(text), HASH_ENCODE_BLOCK_CHARS):
+        hash_object.update(text[start:start + HASH_ENCODE_BLOCK_CHARS].encode('utf-8'))
+
+
+def _loads_json(raw):
+    """Parse a cached JSON document, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_json(obj):
+    """Serialize an object for caching, using orjson (UTF-8 bytes) when available."""
+    if ORJSON_AVAILABLE:
+        # orjson.JSONEncodeError subclasses TypeError
+        return orjson.dumps(obj)
+    return json.dumps(obj)
+
+
+def _pack_value(value):
+    """Compress a serialized cache value for storage if it is large enough."""
+    data = value.encode('utf-8') if isinstance(value, str) else value
+    if len(data) < COMPRESS_MIN_BYTES:
+        return value
+    if ZSTD_AVAILABLE:
+        return ZSTD_MARKER + base64.b64encode(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)).decode('ascii')
+    return ZLIB_MARKER + base64.b64encode(zlib.compress(data)).decode('ascii')
+
+
+def _unpack_value(raw):
+    """Reverse _pack_value; values stored uncompressed are returned unchanged."""
+    if not isinstance(raw, str) or not raw.startswith("\x00"):
+        return raw
+    if raw.startswith(ZSTD_MARKER) and not ZSTD_AVAILABLE:
+        # Written by a worker with zstandard installed; treat as a cache miss
+        logger.warning("Cached value is zstd-compressed but zstandard is not installed")
+        return None
+    try:
+        if raw.startswith(ZSTD_MARKER):
+            data = zstandard.ZstdDecompressor().decompress(base64.b64decode(raw[len(ZSTD_MARKER):]))
+        elif raw.startswith(ZLIB_MARKER):
+            data = zlib.decompress(base64.b64decode(raw[len(ZLIB_MARKER):]))
+        else:
+            return raw
+        return data.decode('utf-8')
+    except Exception as e:
+        # A corrupt entry is a cache miss, not an error for the caller
+        logger.error(f"Failed to decompress cached value: {e}")
+        return None
+
+
 class CacheManager:
     """
     Redis-based cache manager with multi-layer caching strategy.
@@ -48,6 +151,8 @@ class CacheManager:
         """
         self.redis = redis_client
         self.default_ttl = default_ttl
+        self._l0_transcripts = TTLCache(L0_TRANSCRIPT_MAXSIZE, L0_TTL_SECONDS)
+        self._l0_summaries = TTLCache(L0_SUMMARY_MAXSIZE, L0_TTL_SECONDS)
 
         # Test Redis connection on initialization
         if self.redis:
@@ -77,12 +182,14 @@ class CacheManager:
             return None
             
         try:
-            key = f"transcript:{video_id}"
-            cached_data = self.redis.get(key)
-            
+            cached_data = self._l0_transcripts.get(video_id)
+            if cached_data is None:
+                cached_data = _unpack_value(self.redis.get(f"transcript:{video_id}"))
+                self._l0_transcripts.set(video_id, cached_data)
+
             if cached_data:
                 logger.info(f"Cache HIT for transcript:{video_id}")
-                return json.loads(cached_data)
+                return _loads_json(cached_data)
             else:
                 logger.info(f"Cache MISS for transcript:{video_id}")
                 return None
@@ -91,6 +198,61 @@ class CacheManager:
             logger.error(f"Cache retrieval error for transcript:{video_id}: {e}")
             return None
     
+    def get_cached_transcripts(self, video_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Retrieve cached transcript data for several videos in one round trip.
+
+        Issues a single MGET instead of one GET per video, so looking up a
+        playlist costs one network round trip rather than one per video.
+
+        Args:
+            video_ids: YouTube video IDs
+
+        Returns:
+            dict: Cached transcript data (or None if not cached) by video ID
+        """
+        if not self.redis or not video_ids:
+            return {video_id: None for video_id in video_ids}
+
+        try:
+            cached_data = {video_id: self._l0_transcripts.get(video_id) for video_id in video_ids}
+            missing = [video_id for video_id, data in cached_data.items() if data is None]
+            if missing:
+                for video_id, data in zip(missing, self._mget([f"transcript:{v}" for v in missing])):
+                    data = _unpack_value(data)
+                    cached_data[video_id] = data
+                    self._l0_transcripts.set(video_id, data)
+
+            results = {
+                video_id: _loads_json(cached_data[video_id]) if cached_data[video_id] else None
+                for video_id in video_ids
+            }
+            hits = sum(1 for data in results.values() if data is not None)
+            logger.info(f"Cache HIT for {hits}/{len(video_ids)} transcripts")
+            return results
+
+        except (redis.RedisError, json.JSONDecodeError) as e:
+            logger.error(f"Cache retrieval error for {len(video_ids)} transcripts: {e}")
+            return {video_id: None for video_id in video_ids}
+
+    def _mget(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Fetch several keys in as few round trips as the deployment allows.
+
+        On a single Redis this is one MGET. On Redis Cluster a multi-key MGET
+        fails unless every key hashes to the same slot, so keys are grouped by
+        slot and sent as one pipeline per node (mget_nonatomic).
+
+        Args:
+            keys: Redis keys
+
+        Returns:
+            list: Values (or None) in the same order as keys
+        """
+        if isinstance(self.redis, redis.RedisCluster):
+            return self.redis.mget_nonatomic(keys)
+        return self.redis.mget(keys)
+
     def cache_transcript(self, video_id: str, transcript_data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
         """
         Cache transcript data with expiration.
@@ -115,9 +277,11 @@ class CacheManager:
             expiration = ttl or self.default_ttl
             
             # Serialize data to JSON and store with expiration
-            success = self.redis.setex(key, expiration, json.dumps(transcript_data))
+            value = _dumps_json(transcript_data)
+            success = self.redis.setex(key, expiration, _pack_value(value))
             
             if success:
+                self._l0_transcripts.set(video_id, value)
                 logger.info(f"Cached transcript:{video_id} with TTL {expiration}s")
             return success
             
@@ -125,7 +289,7 @@ class CacheManager:
             logger.error(f"Cache storage error for transcript:{video_id}: {e}")
             return False
     
-    def get_cached_summary(self, content_hash: str) -> Optional[str]:
+    def get_cached_summary(self, content_hash: str) -> Optional[Any]:
         """
         Retrieve cached AI summary based on content hash.
         
@@ -137,18 +301,25 @@ class CacheManager:
             content_hash: SHA-256 hash of transcript content
             
         Returns:
-            str: Cached summary text, or None if not cached
+            dict: Cached JSON summary, or None if not cached. Legacy entries
+            stored as plain text are returned unchanged as str.
         """
         if not self.redis:
             return None
             
         try:
-            key = f"summary:{content_hash}"
-            cached_summary = self.redis.get(key)
+            cached_summary = self._l0_summaries.get(content_hash)
+            if cached_summary is None:
+                cached_summary = _unpack_value(self.redis.get(f"summary:{content_hash}"))
+                self._l0_summaries.set(content_hash, cached_summary)
             
             if cached_summary:
                 logger.info(f"Cache HIT for summary:{content_hash}")
-                return cached_summary
+                try:
+                    return _loads_json(cached_summary)
+                except json.JSONDecodeError:
+                    # Legacy plain-text summary written before JSON serialization
+                    return cached_summary
             else:
                 logger.info(f"Cache MISS for summary:{content_hash}")
                 return None
@@ -157,17 +328,59 @@ class CacheManager:
             logger.error(f"Cache retrieval error for summary:{content_hash}: {e}")
             return None
     
-    def cache_summary(self, content_hash: str, summary: str, ttl: Optional[int] = None) -> bool:
+    def get_cached_summaries(self, content_hashes: List[str]) -> Dict[str, Optional[Any]]:
+        """
+        Retrieve cached AI summaries for several content hashes in one round trip.
+
+        Issues a single MGET instead of one GET per hash.
+
+        Args:
+            content_hashes: SHA-256 hashes of transcript content
+
+        Returns:
+            dict: Cached summary (or None if not cached) by content hash. Legacy
+            entries stored as plain text are returned unchanged as str.
+        """
+        if not self.redis or not content_hashes:
+            return {content_hash: None for content_hash in content_hashes}
+
+        cached_summaries = {content_hash: self._l0_summaries.get(content_hash) for content_hash in content_hashes}
+        missing = [content_hash for content_hash, summary in cached_summaries.items() if summary is None]
+        try:
+            if missing:
+                for content_hash, summary in zip(missing, self._mget([f"summary:{h}" for h in missing])):
+                    summary = _unpack_value(summary)
+                    cached_summaries[content_hash] = summary
+                    self._l0_summaries.set(content_hash, summary)
+        except redis.RedisError as e:
+            logger.error(f"Cache retrieval error for {len(content_hashes)} summaries: {e}")
+            return {content_hash: None for content_hash in content_hashes}
+
+        results = {}
+        for content_hash in content_hashes:
+            cached_summary = cached_summaries[content_hash]
+            try:
+                results[content_hash] = _loads_json(cached_summary) if cached_summary else None
+            except json.JSONDecodeError:
+                # Legacy plain-text summary written before JSON serialization
+                results[content_hash] = cached_summary
+
+        hits = sum(1 for summary in results.values() if summary is not None)
+        logger.info(f"Cache HIT for {hits}/{len(content_hashes)} summaries")
+        return results
+
+    def cache_summary(self, content_hash: str, summary: Any, ttl: Optional[int] = None) -> bool:
         """
         Cache AI-generated summary with longer TTL.
         
         AI summaries are expensive to generate and relatively stable,
         so we cache them longer than transcripts. Uses content hash
         as key to ensure cache consistency across identical content.
+        Structured (dict) summaries are serialized to JSON before storage.
         
         Args:
             content_hash: SHA-256 hash of source content
-            summary: AI-generated summary text
+            summary: AI-generated summary (JSON dict or legacy text)
             ttl: Custom TTL in seconds (24 hours default)
             
         Returns:
@@ -181,16 +394,157 @@ class CacheManager:
             # Default to 24 hours for AI summaries (more expensive to regenerate)
             expiration = ttl or (self.default_ttl * 24)
             
-            success = self.redis.setex(key, expiration, summary)
+            value = summary if isinstance(summary, str) else _dumps_json(summary)
+            success = self.redis.setex(key, expiration, _pack_value(value))
             
             if success:
+                self._l0_summaries.set(content_hash, value)
                 logger.info(f"Cached summary:{content_hash} with TTL {expiration}s")
             return success
             
-        except redis.RedisError as e:
+        except (redis.RedisError, TypeError) as e:
             logger.error(f"Cache storage error for summary:{content_hash}: {e}")
             return False
     
+    def cache_summaries(self, content_hashes: Iterable[str], summary: Any, ttl: Optional[int] = None) -> bool:
+        """
+        Cache one AI summary under several content hashes in one round trip.
+
+        Used for the exact and near-duplicate keys of a generated summary: the
+        summary is serialized once and all SETEX commands are sent in a single
+        (non-transactional) pipeline instead of one request per key.
+
+        Args:
+            content_hashes: Hashes to store the summary under
+            summary: AI-generated summary (JSON dict, pre-serialized JSON
+                str/bytes, or legacy text)
+            ttl: Custom TTL in seconds (24 hours default)
+
+        Returns:
+            bool: True if every key was cached successfully, False otherwise
+        """
+        if not self.redis:
+            return False
+
+        try:
+            expiration = ttl or (self.default_ttl * 24)
+            value = summary if isinstance(summary, (str, bytes)) else _dumps_json(summary)
+
+            content_hashes = list(content_hashes)
+            packed = _pack_value(value)
+            # On Redis Cluster this is a ClusterPipeline, which sends one batch per node
+            pipe = self.redis.pipeline(transaction=False)
+            for content_hash in content_hashes:
+                pipe.setex(f"summary:{content_hash}", expiration, packed)
+            results = pipe.execute()
+
+            for content_hash, success in zip(content_hashes, results):
+                if success:
+                    self._l0_summaries.set(content_hash, value)
+
+            logger.info(f"Cached {len(results)} summary keys with TTL {expiration}s")
+            return all(results)
+
+        except (redis.RedisError, TypeError) as e:
+            logger.error(f"Cache storage error for summary keys: {e}")
+            return False
+
+    def get_cached_chunk_summary(self, chunk_hash: str) -> Optional[str]:
+        """
+        Retrieve a cached intermediate summary of one transcript chunk.
+
+        Chunk summaries of long videos are reused across retries and re-runs,
+        so a failed final pass doesn't pay for every chunk again.
+        Cache key format: "chunk_summary:{chunk_hash}"
+
+        Args:
+            chunk_hash: Hash of the chunk prompt version, model and chunk text
+
+        Returns:
+            str: Cached plain-text chunk summary, or None if not cached
+        """
+        if not self.redis:
+            return None
+
+        try:
+            cached_summary = self.redis.get(f"chunk_summary:{chunk_hash}")
+            if cached_summary:
+                logger.info(f"Cache HIT for chunk_summary:{chunk_hash}")
+            return cached_summary
+
+        except redis.RedisError as e:
+            logger.error(f"Cache retrieval error for chunk_summary:{chunk_hash}: {e}")
+            return None
+
+    def cache_chunk_summary(self, chunk_hash: str, summary: str, ttl: Optional[int] = None) -> bool:
+        """
+        Cache an intermediate summary of one transcript chunk.
+
+        Args:
+            chunk_hash: Hash of the chunk prompt version, model and chunk text
+            summary: Plain-text chunk summary
+            ttl: Custom TTL in seconds (1 week default)
+
+        Returns:
+            bool: True if cached successfully, False otherwise
+        """
+        if not self.redis:
+            return False
+
+        try:
+            expiration = ttl or (self.default_ttl * 24 * 7)
+            return self.redis.setex(f"chunk_summary:{chunk_hash}", expiration, summary)
+
+        except redis.RedisError as e:
+            logger.error(f"Cache storage error for chunk_summary:{chunk_hash}: {e}")
+            return False
+
+    def get_summary_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the metadata of a submitted summary batch job.
+
+        Cache key format: "summary_batch:{batch_id}"
+
+        Args:
+            batch_id: OpenAI Batch API job ID
+
+        Returns:
+            dict: Batch metadata (mode and cache keys per request), or None if unknown
+        """
+        if not self.redis:
+            return None
+
+        try:
+            metadata = self.redis.get(f"summary_batch:{batch_id}")
+            return _loads_json(metadata) if metadata else None
+
+        except (redis.RedisError, json.JSONDecodeError) as e:
+            logger.error(f"Cache retrieval error for summary_batch:{batch_id}: {e}")
+            return None
+
+    def cache_summary_batch(self, batch_id: str, metadata: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Store the metadata of a submitted summary batch job until it is collected.
+
+        Args:
+            batch_id: OpenAI Batch API job ID
+            metadata: Batch metadata (mode and cache keys per request)
+            ttl: Custom TTL in seconds (48 hours default, past the 24h completion window)
+
+        Returns:
+            bool: True if cached successfully, False otherwise
+        """
+        if not self.redis:
+            return False
+
+        try:
+            expiration = ttl or (self.default_ttl * 48)
+            return self.redis.setex(f"summary_batch:{batch_id}", expiration, _dumps_json(metadata))
+
+        except (redis.RedisError, TypeError) as e:
+            logger.error(f"Cache storage error for summary_batch:{batch_id}: {e}")
+            return False
+
     def generate_content_hash(self, content: str) -> str:
         """
         Generate deterministic hash for content-based caching.
@@ -206,10 +560,35 @@ class CacheManager:
             str: 16-character hex hash (truncated for readability)
         """
         # Create SHA-256 hash of content
-        hash_object = hashlib.sha256(content.encode('utf-8'))
+        # Cache keys are not a security boundary; usedforsecurity=False keeps
+        # hashing available (and on the fast path) on FIPS-restricted builds
+        hash_object = hashlib.sha256(usedforsecurity=False)
+        _update_hash(hash_object, content)
         
         # Return first 16 characters for cache key (sufficient for uniqueness)
         return hash_object.hexdigest()[:16]
+
+    def generate_content_hash_streaming(self, parts: Iterable[str]) -> str:
+        """
+        Generate deterministic hash over several content parts without joining them.
+
+        Feeds each part into the hash incrementally, so hashing a large transcript
+        together with its cache parameters never builds one giant intermediate
+        string. Parts are delimited so ("ab", "c") and ("a", "bc") hash differently.
+
+        Args:
+            parts: Text parts to hash, in order
+
+        Returns:
+            str: 16-character hex hash (same length as generate_content_hash)
+        """
+        # BLAKE2b is faster than SHA-256 on long inputs; 8-byte digest = 16 hex chars
+        hash_object = hashlib.blake2b(digest_size=8, usedforsecurity=False)
+        for part in parts:
+            _update_hash(hash_object, part)
+            hash_object.update(b'\x1f')
+
+        return hash_object.hexdigest()
     
     def invalidate_video_cache(self, video_id: str) -> bool:
         """
@@ -229,7 +608,8 @@ class CacheManager:
             return False
             
         try:
-            # Remove transcript cache
+            # Remove transcript cache (this worker's L0 copy too)
+            self._l0_transcripts.pop(video_id)
             transcript_key = f"transcript:{video_id}"
             deleted_count = self.redis.delete(transcript_key)
             
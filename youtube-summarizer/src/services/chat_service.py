@@ -9,18 +9,92 @@ summary and transcript to provide relevant, accurate responses.
 import os
 import json
 import logging
-from typing import List, Dict, Optional
-import requests
+from functools import lru_cache
+from typing import List, Dict, Iterator, Optional, Tuple
+import httpx
+
+from src.utils.error_handler import AIProcessingError, RateLimitError, retry_with_backoff
+from src.utils.token_bucket import TokenBucket
+
+# orjson is a faster C JSON encoder/decoder; fall back to the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTTP/2 support requires the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# tiktoken is optional - exact token budget for the transcript excerpt
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Client-side cap on OpenAI requests per minute, shared by all chat requests in
+# this process so bursts are smoothed locally instead of rejected with 429s
+OPENAI_MAX_REQUESTS_PER_MINUTE = int(os.environ.get('OPENAI_MAX_REQUESTS_PER_MINUTE', '500'))
+_openai_rate_limiter = TokenBucket(OPENAI_MAX_REQUESTS_PER_MINUTE)
+
+# Shared HTTP client for OpenAI requests
+# Keeps connections alive across chat requests so only the first call pays the
+# TCP+TLS handshake, and multiplexes concurrent requests over HTTP/2 when available
+_http_client = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=32),
+    headers={"Content-Type": "application/json"}
+)
+
 # Maximum conversation history to maintain (to avoid token limits)
 MAX_HISTORY_MESSAGES = 10
+# History is also capped in tokens: the oldest messages are dropped until the
+# rest fit, so a few very long turns can't crowd out the video context
+MAX_HISTORY_TOKENS = 4000
 
 # Maximum user message length (safety guardrail)
 MAX_MESSAGE_LENGTH = 500
 
+# Transcript excerpt included in the chat context, in tokens (~5000 characters)
+MAX_TRANSCRIPT_TOKENS = 1250
+# Only this many characters per budgeted token are tokenized, so the cost of
+# trimming the excerpt doesn't grow with the transcript length
+MAX_CHARS_PER_TOKEN = 8
+# Encoding used by gpt-4o-mini
+TOKEN_ENCODING_NAME = "o200k_base"
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding():
+    """
+    Load the tiktoken encoding once per process.
+
+    Returns:
+        tiktoken.Encoding, or None if unavailable (e.g. no network access to
+        download it), in which case the excerpt is trimmed by characters
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING_NAME)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding '{TOKEN_ENCODING_NAME}' unavailable, trimming transcripts by characters: {e}")
+        return None
+
 
 class ChatService:
     """
@@ -36,6 +110,9 @@ class ChatService:
         if not self.api_key:
             logger.error("OPENAI_API_KEY environment variable not set")
             raise ValueError("OPENAI_API_KEY environment variable not set")
+
+        # Authorization header is built once; Content-Type is set on the shared client
+        self._headers = {"Authorization": f"Bearer {self.api_key}"}
         
         logger.info("ChatService initialized")
     
@@ -63,15 +140,7 @@ class ChatService:
         Raises:
             ValueError: If message is empty or too long
         """
-        # Input validation
-        if not message or not message.strip():
-            raise ValueError("Message cannot be empty")
-        
-        if len(message) > MAX_MESSAGE_LENGTH:
-            raise ValueError(f"Message too long (max {MAX_MESSAGE_LENGTH} characters)")
-        
-        # Sanitize message (basic XSS prevention)
-        message = message.strip()
+        message = self._validate_message(message)
         
         try:
             # Build context from video content
@@ -100,6 +169,62 @@ class ChatService:
                 "error": str(e)
             }
     
+    def chat_stream(
+        self,
+        message: str,
+        video_title: str,
+        summary: Dict,
+        transcript: str,
+        conversation_history: Optional[List[Dict]] = None
+    ) -> Iterator[str]:
+        """
+        Generate an AI chat response as a stream of text fragments.
+
+        Same context and guardrails as chat(), but the reply is yielded as
+        the model produces it, so the client can render the first words
+        after the time-to-first-token instead of the whole completion.
+
+        Args:
+            message: User's question/message
+            video_title: Title of the video
+            summary: Structured JSON summary of the video
+            transcript: Full video transcript
+            conversation_history: Previous messages in conversation (optional)
+
+        Returns:
+            Iterator of response text fragments
+
+        Raises:
+            ValueError: If message is empty or too long (raised immediately)
+            RuntimeError: If the API call fails (raised while iterating)
+        """
+        message = self._validate_message(message)
+        context = self._build_context(video_title, summary, transcript)
+        messages = self._build_messages(context, message, conversation_history)
+        return self._stream_openai(messages)
+
+    def _validate_message(self, message: str) -> str:
+        """
+        Check a user message against the guardrails.
+
+        Args:
+            message: User's question/message
+
+        Returns:
+            str: Sanitized message
+
+        Raises:
+            ValueError: If message is empty or too long
+        """
+        if not message or not message.strip():
+            raise ValueError("Message cannot be empty")
+
+        if len(message) > MAX_MESSAGE_LENGTH:
+            raise ValueError(f"Message too long (max {MAX_MESSAGE_LENGTH} characters)")
+
+        # Sanitize message (basic XSS prevention)
+        return message.strip()
+
     def _build_context(self, video_title: str, summary: Dict, transcript: str) -> str:
         """
         Build context string from video content.
@@ -140,15 +265,39 @@ class ChatService:
             context_parts.append("")
         
         # Add transcript (truncated to avoid token limits)
-        max_transcript_length = 5000
         if transcript:
-            truncated_transcript = transcript[:max_transcript_length]
-            if len(transcript) > max_transcript_length:
+            truncated_transcript, truncated = self._truncate_transcript(transcript)
+            if truncated:
                 truncated_transcript += "... [transcript truncated]"
             context_parts.append(f"Transcript:\n{truncated_transcript}")
         
         return "\n".join(context_parts)
     
+    def _truncate_transcript(self, transcript: str, max_tokens: int = MAX_TRANSCRIPT_TOKENS) -> Tuple[str, bool]:
+        """
+        Cut a transcript down to a token budget for the chat context.
+
+        Only a prefix that is certain to cover the budget is tokenized, so
+        long transcripts cost no more than short ones on every chat turn.
+
+        Args:
+            transcript: Full transcript
+            max_tokens: Token budget for the excerpt
+
+        Returns:
+            tuple: (excerpt, whether anything was cut off)
+        """
+        encoding = _get_token_encoding()
+        if not encoding:
+            max_chars = max_tokens * 4
+            return transcript[:max_chars], len(transcript) > max_chars
+
+        prefix = transcript[:max_tokens * MAX_CHARS_PER_TOKEN]
+        tokens = encoding.encode(prefix, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return prefix, len(transcript) > len(prefix)
+        return encoding.decode(tokens[:max_tokens]), True
+
     def _build_messages(
         self,
         context: str,
@@ -185,9 +334,7 @@ VIDEO CONTEXT:
         
         # Add conversation history (limited to avoid token limits)
         if conversation_history:
-            # Take only the most recent messages
-            recent_history = conversation_history[-MAX_HISTORY_MESSAGES:]
-            messages.extend(recent_history)
+            messages.extend(self._recent_history(conversation_history))
         
         # Add current user message
         messages.append({
@@ -197,6 +344,35 @@ VIDEO CONTEXT:
         
         return messages
     
+    def _recent_history(self, conversation_history: List[Dict], max_tokens: int = MAX_HISTORY_TOKENS) -> List[Dict]:
+        """
+        Select the most recent history messages that fit the token budget.
+
+        Walks back from the newest message (at most MAX_HISTORY_MESSAGES) and
+        stops at the first one that would exceed the budget, so the kept
+        history is always a contiguous, most-recent window.
+
+        Args:
+            conversation_history: Previous messages, oldest first
+            max_tokens: Token budget for the kept messages
+
+        Returns:
+            list: Kept messages, oldest first
+        """
+        encoding = _get_token_encoding()
+        kept, used = [], 0
+        for message in reversed(conversation_history[-MAX_HISTORY_MESSAGES:]):
+            content = str(message.get("content", ""))
+            tokens = len(encoding.encode(content, disallowed_special=())) if encoding else len(content) // 4
+            if used + tokens > max_tokens:
+                break
+            kept.append(message)
+            used += tokens
+
+        if len(kept) < len(conversation_history):
+            logger.info(f"Kept {len(kept)}/{len(conversation_history)} history messages (~{used} tokens)")
+        return kept[::-1]
+
     def _call_openai(self, messages: List[Dict]) -> str:
         """
         Call OpenAI API to generate response.
@@ -211,42 +387,33 @@ VIDEO CONTEXT:
             RuntimeError: If API call fails
         """
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": "gpt-4o-mini",
-                "messages": messages,
-                "temperature": 0.7,  # Slightly higher for conversational responses
-                "max_tokens": 500    # Limit response length
-            }
-            
             logger.info(f"Sending chat request to OpenAI API")
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            response = self._post_chat_completion(self._headers, self._encode_payload(messages))
             
             if response.status_code != 200:
                 error_msg = response.text
                 logger.error(f"OpenAI API error: {response.status_code} - {error_msg}")
                 raise RuntimeError(f"OpenAI API error: {response.status_code}")
             
-            result = response.json()
+            result = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
             ai_response = result["choices"][0]["message"]["content"].strip()
             
             logger.info(f"Generated chat response ({len(ai_response)} chars)")
             return ai_response
         
-        except requests.exceptions.Timeout:
+        except RateLimitError as e:
+            logger.error(f"OpenAI API still rate limited after retries: {e}")
+            raise RuntimeError("AI service is busy (rate limit). Please try again in a moment.")
+
+        except AIProcessingError as e:
+            logger.error(f"OpenAI API still failing after retries: {e}")
+            raise RuntimeError(f"OpenAI API error: {e}")
+
+        except httpx.TimeoutException:
             logger.error("OpenAI API request timed out")
             raise RuntimeError("Request timed out. Please try again.")
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"OpenAI API request failed: {e}")
             raise RuntimeError(f"API request failed: {e}")
         
@@ -254,3 +421,121 @@ VIDEO CONTEXT:
             logger.error(f"Unexpected error in OpenAI API call: {e}")
             raise RuntimeError(f"Unexpected error: {e}")
 
+    def _stream_openai(self, messages: List[Dict]) -> Iterator[str]:
+        """
+        Call the OpenAI API with server-sent event streaming.
+
+        Args:
+            messages: Array of message dicts
+
+        Yields:
+            str: Response text fragments as they arrive
+
+        Raises:
+            RuntimeError: If the API call fails
+        """
+        try:
+            logger.info("Sending streaming chat request to OpenAI API")
+            response = self._post_chat_completion(self._headers, self._encode_payload(messages, stream=True), stream=True)
+        except RateLimitError as e:
+            logger.error(f"OpenAI API still rate limited after retries: {e}")
+            raise RuntimeError("AI service is busy (rate limit). Please try again in a moment.")
+        except (AIProcessingError, httpx.HTTPError) as e:
+            logger.error(f"OpenAI streaming request failed: {e}")
+            raise RuntimeError(f"OpenAI API error: {e}")
+
+        try:
+            if response.status_code != 200:
+                response.read()
+                logger.error(f"OpenAI API error: {response.status_code} - {response.text}")
+                raise RuntimeError(f"OpenAI API error: {response.status_code}")
+
+            length = 0
+            for line in response.iter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                choices = (orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)).get("choices")
+                content = choices[0].get("delta", {}).get("content") if choices else None
+                if content:
+                    length += len(content)
+                    yield content
+
+            logger.info(f"Streamed chat response ({length} chars)")
+
+        except httpx.HTTPError as e:
+            logger.error(f"OpenAI streaming response failed: {e}")
+            raise RuntimeError(f"API request failed: {e}")
+
+        finally:
+            response.close()
+
+    def _encode_payload(self, messages: List[Dict], stream: bool = False) -> bytes:
+        """
+        Build and encode a chat completion request body.
+
+        Args:
+            messages: Array of message dicts
+            stream: Request a server-sent event stream
+
+        Returns:
+            bytes: JSON-encoded request payload
+        """
+        payload = {
+            "model": "gpt-4o-mini",
+            "messages": messages,
+            "temperature": 0.7,  # Slightly higher for conversational responses
+            "max_tokens": 500    # Limit response length
+        }
+        if stream:
+            payload["stream"] = True
+
+        # Payload carries the full video context, so encode it with orjson when available
+        return orjson.dumps(payload) if ORJSON_AVAILABLE else json.dumps(payload).encode('utf-8')
+
+    @retry_with_backoff(
+        max_retries=4,
+        initial_delay=1.0,
+        max_delay=30.0,
+        jitter=True,
+        exceptions=(RateLimitError, AIProcessingError, httpx.ConnectError)
+    )
+    def _post_chat_completion(self, headers: Dict, body: bytes, stream: bool = False) -> httpx.Response:
+        """
+        Send one chat completion request, retrying transient failures.
+
+        Waits on the shared rate limiter before each attempt. 429 and 5xx
+        responses raise so the retry decorator backs off (honoring any
+        Retry-After header); other responses are returned to the caller.
+
+        Args:
+            headers: Request headers (authorization)
+            body: JSON-encoded request payload
+            stream: Return as soon as the headers arrive, leaving the body
+                unread (the caller must close the response)
+
+        Returns:
+            httpx.Response: Final (non-retryable) response
+
+        Raises:
+            RateLimitError: If still rate limited after all retries
+            AIProcessingError: If the server keeps returning 5xx errors
+        """
+        _openai_rate_limiter.acquire()
+        if stream:
+            request = _http_client.build_request("POST", OPENAI_CHAT_URL, headers=headers, content=body)
+            response = _http_client.send(request, stream=True)
+        else:
+            response = _http_client.post(OPENAI_CHAT_URL, headers=headers, content=body)
+
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            response.close()
+            retry_after = response.headers.get("retry-after")
+            retry_after = float(retry_after) if retry_after and retry_after.replace(".", "", 1).isdigit() else None
+            if response.status_code == 429:
+                raise RateLimitError("OpenAI API rate limited (429)", retry_after=retry_after)
+            raise AIProcessingError(f"OpenAI API server error: {response.status_code}")
+
+        return response
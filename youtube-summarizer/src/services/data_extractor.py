@@ -24,11 +24,15 @@ Design Principles:
 
 import re
 import logging
+from itertools import islice
 from typing import Dict, List, Any
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of key metrics reported per summary
+MAX_KEY_METRICS = 5
+
 
 class DataExtractor:
     """
@@ -46,21 +50,54 @@ class DataExtractor:
         >>> print(data['key_points'])  # ['Variables and data types', ...]
     """
     
+    # Key metrics are reported in this order, percentages first
+    METRIC_TYPE_ORDER = ("percentage", "currency", "date", "measurement", "numeric")
+
     def __init__(self):
         """Initialize with compiled regex patterns for performance."""
-        # General-purpose metric patterns
-        self.percentage_pattern = re.compile(r'(\d+\.?\d*)\s*%')
-        self.currency_pattern = re.compile(r'\$\s*(\d+\.?\d*)')
-        self.numeric_pattern = re.compile(r'(\d+\.?\d*)\s*(million|billion|thousand|k|m|b)')
-        self.date_pattern = re.compile(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})')
-        self.measurement_pattern = re.compile(
-            r'(\d+\.?\d*)\s*(km|miles|kg|lbs|hours|minutes|seconds|degrees|meters|feet|cm|inches)'
+        # General-purpose metric patterns, combined so a summary is scanned once.
+        # Where alternatives overlap (e.g. "5 minutes" vs "5 m"), the earlier one wins.
+        # Numbers are written unambiguously (\d+(?:\.\d*)?) and may not start inside
+        # a longer digit run, which keeps matching linear on long runs of digits. The
+        # leading lookahead lets the engine skip ahead to the next digit or "$".
+        self.metric_pattern = re.compile(
+            r'(?=[\d$])(?:'
+            r'\$\s*(?P<currency>\d+(?:\.\d*)?)'
+            r'|(?<!\d)(?:'
+            r'(?P<date>\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'
+            r'|(?P<percentage>\d+(?:\.\d*)?)\s*%'
+            r'|(?P<measurement>\d+(?:\.\d*)?\s*'
+            r'(?:km|miles|kg|lbs|hours|minutes|seconds|degrees|meters|feet|cm|inches))'
+            r'|(?P<numeric>\d+(?:\.\d*)?\s*(?:million|billion|thousand|k|m|b))'
+            r'))'
+        )
+
+        # Executive summary patterns: the body following the first line that mentions
+        # an overview/summary, up to the next heading
+        self.overview_section_pattern = re.compile(
+            r'^[^\n]*(?:overview|summary)[^\n]*\n((?:(?!#)[^\n]*(?:\n|\Z))*)',
+            re.IGNORECASE | re.MULTILINE
+        )
+        self.nonblank_line_pattern = re.compile(r'^[ \t]*(\S.*?)\s*$', re.MULTILINE)
+        self.sentence_split_pattern = re.compile(r'[.!?]+')
+
+        # Action item patterns; verbs match as substrings ("reviewing", "updates").
+        # The section body is consumed line by line up to a "\n#" heading, with no
+        # lazy quantifier or lookahead re-checked at every character.
+        self.action_section_pattern = re.compile(
+            r'(?:action items|takeaways|recommendations)\s+((?:[^\n]+|\n(?!#))*)',
+            re.IGNORECASE
+        )
+        self.imperative_pattern = re.compile(
+            r'review|consider|monitor|check|verify|update|adjust|evaluate|assess|analyze',
+            re.IGNORECASE
         )
 
         # Timestamp and structure patterns
         self.timestamp_pattern = re.compile(r'(\d{1,2}):(\d{2})(?::(\d{2}))?')
-        self.bullet_pattern = re.compile(r'^[\s]*[-*]\s+(.+)$', re.MULTILINE)
-        self.section_pattern = re.compile(r'^#+\s+(.+)$', re.MULTILINE)
+        self.importance_pattern = re.compile(r'important|critical|key|major|significant', re.IGNORECASE)
+        # Indentation and the gap after the marker stay on the bullet's own line
+        self.bullet_pattern = re.compile(r'^[ \t]*[-*][ \t]+(.+)$', re.MULTILINE)
 
         logger.info("DataExtractor initialized with compiled patterns")
     
@@ -121,27 +158,15 @@ class DataExtractor:
         """
         try:
             # Look for Overview or Summary section
-            lines = summary.split('\n')
-            in_overview = False
             overview_text = []
-            
-            for line in lines:
-                if 'overview' in line.lower() or 'summary' in line.lower():
-                    in_overview = True
-                    continue
-                
-                if in_overview:
-                    if line.startswith('#'):  # New section
-                        break
-                    if line.strip():
-                        overview_text.append(line.strip())
-                        if len(overview_text) >= 2:  # Get 1-2 sentences
-                            break
-            
+            match = self.overview_section_pattern.search(summary)
+            if match:
+                overview_text = self.nonblank_line_pattern.findall(match.group(1))[:2]
+
             if overview_text:
                 text = ' '.join(overview_text)
                 # Extract first 1-2 sentences
-                sentences = re.split(r'[.!?]+', text)
+                sentences = self.sentence_split_pattern.split(text)
                 result = '. '.join(s.strip() for s in sentences[:2] if s.strip())
                 if result:
                     result = result[:200]  # Limit to 200 chars
@@ -178,68 +203,45 @@ class DataExtractor:
             List of dicts with keys: name, value, type
         """
         try:
-            metrics = []
-            seen_values = set()
-
-            # Extract percentages (any domain)
-            for match in self.percentage_pattern.finditer(summary):
-                value = match.group(1)
-                if value not in seen_values:
-                    metrics.append({
-                        "name": self._extract_context(summary, match),
-                        "value": f"{value}%",
-                        "type": "percentage"
-                    })
-                    seen_values.add(value)
-
-            # Extract currency values (any domain)
-            for match in self.currency_pattern.finditer(summary):
-                value = match.group(1)
-                if value not in seen_values:
-                    metrics.append({
-                        "name": self._extract_context(summary, match),
-                        "value": f"${value}",
-                        "type": "currency"
-                    })
-                    seen_values.add(value)
-
-            # Extract dates (NEW)
-            for match in self.date_pattern.finditer(summary):
-                value = match.group(1)
-                if value not in seen_values:
-                    metrics.append({
-                        "name": "Date",
-                        "value": value,
-                        "type": "date"
-                    })
-                    seen_values.add(value)
+            matches_by_type = {metric_type: [] for metric_type in self.METRIC_TYPE_ORDER}
+            percentages = set()
+            for match in self.metric_pattern.finditer(summary):
+                matches_by_type[match.lastgroup].append(match)
+
+                # Five distinct percentages outrank anything later in the text
+                if match.lastgroup == "percentage":
+                    percentages.add(match.group("percentage"))
+                    if len(percentages) == MAX_KEY_METRICS:
+                        break
 
-            # Extract measurements (NEW)
-            for match in self.measurement_pattern.finditer(summary):
-                value = match.group(0)
-                if value not in seen_values:
-                    metrics.append({
-                        "name": self._extract_context(summary, match),
-                        "value": value,
-                        "type": "measurement"
-                    })
-                    seen_values.add(value)
+            # Emit by type priority; context is only computed for metrics that are kept
+            metrics = []
+            seen_values = set()  # (type, value), so "5%" and "$5" are both kept
+            for metric_type in self.METRIC_TYPE_ORDER:
+                for match in matches_by_type[metric_type]:
+                    value = match.group(metric_type)
+                    if (metric_type, value) in seen_values:
+                        continue
+                    seen_values.add((metric_type, value))
+
+                    if metric_type == "percentage":
+                        display_value = f"{value}%"
+                    elif metric_type == "currency":
+                        display_value = f"${value}"
+                    else:
+                        display_value = value
 
-            # Extract large numbers (NEW)
-            for match in self.numeric_pattern.finditer(summary):
-                value = match.group(0)
-                if value not in seen_values:
                     metrics.append({
-                        "name": self._extract_context(summary, match),
-                        "value": value,
-                        "type": "numeric"
+                        "name": "Date" if metric_type == "date" else self._extract_context(summary, match),
+                        "value": display_value,
+                        "type": metric_type
                     })
-                    seen_values.add(value)
+                    if len(metrics) == MAX_KEY_METRICS:
+                        logger.debug(f"Extracted {len(metrics)} key metrics")
+                        return metrics
 
-            # Limit to top 5 metrics
-            result = metrics[:5]
-            logger.debug(f"Extracted {len(result)} key metrics")
-            return result
+            logger.debug(f"Extracted {len(metrics)} key metrics")
+            return metrics
 
         except Exception as e:
             logger.warning(f"Error extracting key metrics: {e}")
@@ -266,13 +268,13 @@ class DataExtractor:
             List of key point strings
         """
         try:
-            # Find bullet points
-            bullets = self.bullet_pattern.findall(summary)
+            # Find bullet points (only the first five are used, so stop scanning there)
+            bullets = [m.group(1) for m in islice(self.bullet_pattern.finditer(summary), 5)]
             
             if bullets:
                 # Clean and validate
                 points = []
-                for bullet in bullets[:5]:
+                for bullet in bullets:
                     cleaned = bullet.strip('*- ').strip()
                     if 10 < len(cleaned) < 200:  # Validate length
                         points.append(cleaned)
@@ -282,7 +284,7 @@ class DataExtractor:
                     return points
             
             # Fallback: Extract first 3 sentences
-            sentences = re.split(r'[.!?]+', summary)
+            sentences = self.sentence_split_pattern.split(summary)
             points = []
             for sentence in sentences:
                 cleaned = sentence.strip()
@@ -313,29 +315,23 @@ class DataExtractor:
         """
         try:
             # Look for Action Items section
-            action_section = re.search(
-                r'(?:action items|takeaways|recommendations)[\s\n]+(.*?)(?=\n#|\Z)',
-                summary,
-                re.IGNORECASE | re.DOTALL
-            )
+            action_section = self.action_section_pattern.search(summary)
             
             if action_section:
                 section_text = action_section.group(1)
-                bullets = self.bullet_pattern.findall(section_text)
+                bullets = [m.group(1) for m in islice(self.bullet_pattern.finditer(section_text), 5)]
                 
                 if bullets:
-                    items = [b.strip('*- ').strip() for b in bullets[:5]]
+                    items = [b.strip('*- ').strip() for b in bullets]
                     logger.debug(f"Extracted {len(items)} action items")
                     return items
             
             # Fallback: Look for imperative verbs
-            imperative_verbs = ['review', 'consider', 'monitor', 'check', 'verify',
-                              'update', 'adjust', 'evaluate', 'assess', 'analyze']
             items = []
             
-            for sentence in re.split(r'[.!?]+', summary):
+            for sentence in self.sentence_split_pattern.split(summary):
                 cleaned = sentence.strip()
-                if any(verb in cleaned.lower() for verb in imperative_verbs):
+                if self.imperative_pattern.search(cleaned):
                     if 10 < len(cleaned) < 200:
                         items.append(cleaned)
                         if len(items) >= 3:
@@ -372,16 +368,12 @@ class DataExtractor:
                 end = min(len(summary), match.end() + 100)
                 context = summary[start:end]
                 
-                # Extract topic and key point
-                sentences = context.split('.')
-                key_point = sentences[0].strip() if sentences else ""
+                # Extract topic and key point (text up to the first period)
+                period = context.find('.')
+                key_point = (context if period < 0 else context[:period]).strip()
                 
                 # Classify importance
-                importance = "medium"
-                for keyword in ['important', 'critical', 'key', 'major', 'significant']:
-                    if keyword in context.lower():
-                        importance = "high"
-                        break
+                importance = "high" if self.importance_pattern.search(context) else "medium"
                 
                 timestamps.append({
                     "time": time_str,
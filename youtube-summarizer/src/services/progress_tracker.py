@@ -5,14 +5,19 @@ Tracks processing stages and provides progress updates for WebSocket communicati
 """
 
 import logging
+import threading
 import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Videos tracked at once; the least recently updated are dropped beyond this
+MAX_TRACKED_VIDEOS = 10000
+
 
 class ProcessingStage(Enum):
     """Stages of video processing."""
@@ -23,6 +28,16 @@ class ProcessingStage(Enum):
     FAILED = "failed"
 
 
+# Progress percentage reported for each stage when no explicit value is given
+STAGE_PROGRESS: Dict[ProcessingStage, int] = {
+    ProcessingStage.QUEUED: 10,
+    ProcessingStage.EXTRACTING_TRANSCRIPT: 40,
+    ProcessingStage.GENERATING_SUMMARY: 80,
+    ProcessingStage.COMPLETED: 100,
+    ProcessingStage.FAILED: 0
+}
+
+
 @dataclass
 class ProgressUpdate:
     """Data class for progress updates."""
@@ -36,7 +51,27 @@ class ProgressUpdate:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        # All fields are flat values, so asdict()'s recursive deep copy isn't needed
+        return {
+            'video_id': self.video_id,
+            'stage': self.stage,
+            'progress_percent': self.progress_percent,
+            'message': self.message,
+            'timestamp': self.timestamp,
+            'estimated_time_remaining': self.estimated_time_remaining,
+            'error': self.error
+        }
+
+
+@dataclass(slots=True)
+class ProgressState:
+    """Mutable per-video processing state kept by ProgressTracker."""
+    stage: str
+    progress_percent: int
+    start_time: float
+    stage_start_time: float
+    message: str
+    error: Optional[str] = None
 
 
 class ProgressTracker:
@@ -47,9 +82,17 @@ class ProgressTracker:
     progress updates for real-time UI updates.
     """
     
-    def __init__(self):
-        """Initialize progress tracker."""
-        self.progress_data: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, max_tracked: int = MAX_TRACKED_VIDEOS):
+        """
+        Initialize progress tracker.
+        
+        Args:
+            max_tracked: Maximum number of videos to keep state for. Videos that
+                are never cleaned up are evicted least recently updated first.
+        """
+        self.progress_data: OrderedDict[str, ProgressState] = OrderedDict()
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
     
     def start_processing(self, video_id: str) -> None:
         """
@@ -58,13 +101,9 @@ class ProgressTracker:
         Args:
             video_id: YouTube video ID
         """
-        self.progress_data[video_id] = {
-            'stage': ProcessingStage.QUEUED.value,
-            'progress_percent': 0,
-            'start_time': time.time(),
-            'stage_start_time': time.time(),
-            'message': 'Processing queued...'
-        }
+        with self._lock:
+            self.progress_data[video_id] = self._new_state()
+            self._touch(video_id)
         logger.info(f"Started tracking progress for video {video_id}")
     
     def update_stage(
@@ -86,30 +125,20 @@ class ProgressTracker:
         Returns:
             ProgressUpdate: Current progress state
         """
-        if video_id not in self.progress_data:
-            self.start_processing(video_id)
-        
-        data = self.progress_data[video_id]
-        data['stage'] = stage.value
-        data['message'] = message
-        data['stage_start_time'] = time.time()
+        data = self._get_or_create_state(video_id)
+        data.stage = stage.value
+        data.message = message
+        data.stage_start_time = time.time()
         
         # Calculate progress percentage based on stage
         if progress_percent is not None:
-            data['progress_percent'] = progress_percent
+            data.progress_percent = progress_percent
         else:
-            stage_progress = {
-                ProcessingStage.QUEUED: 10,
-                ProcessingStage.EXTRACTING_TRANSCRIPT: 40,
-                ProcessingStage.GENERATING_SUMMARY: 80,
-                ProcessingStage.COMPLETED: 100,
-                ProcessingStage.FAILED: 0
-            }
-            data['progress_percent'] = stage_progress.get(stage, 0)
+            data.progress_percent = STAGE_PROGRESS.get(stage, 0)
         
         logger.info(f"Updated {video_id} to stage {stage.value}: {message}")
         
-        return self._create_progress_update(video_id)
+        return self._create_progress_update(video_id, data)
     
     def complete_processing(self, video_id: str) -> ProgressUpdate:
         """
@@ -139,18 +168,15 @@ class ProgressTracker:
         Returns:
             ProgressUpdate: Final progress state with error
         """
-        if video_id not in self.progress_data:
-            self.start_processing(video_id)
-        
-        data = self.progress_data[video_id]
-        data['stage'] = ProcessingStage.FAILED.value
-        data['message'] = f"Processing failed: {error}"
-        data['error'] = error
-        data['progress_percent'] = 0
+        data = self._get_or_create_state(video_id)
+        data.stage = ProcessingStage.FAILED.value
+        data.message = f"Processing failed: {error}"
+        data.error = error
+        data.progress_percent = 0
         
         logger.error(f"Processing failed for {video_id}: {error}")
         
-        return self._create_progress_update(video_id)
+        return self._create_progress_update(video_id, data)
     
     def get_progress(self, video_id: str) -> Optional[ProgressUpdate]:
         """
@@ -162,26 +188,77 @@ class ProgressTracker:
         Returns:
             ProgressUpdate: Current progress state or None if not found
         """
-        if video_id not in self.progress_data:
+        data = self.progress_data.get(video_id)
+        if data is None:
             return None
         
-        return self._create_progress_update(video_id)
+        return self._create_progress_update(video_id, data)
+    
+    @staticmethod
+    def _new_state() -> ProgressState:
+        """
+        Create the initial state for a newly queued video.
+        
+        Returns:
+            ProgressState: Queued state starting now
+        """
+        now = time.time()
+        return ProgressState(
+            stage=ProcessingStage.QUEUED.value,
+            progress_percent=0,
+            start_time=now,
+            stage_start_time=now,
+            message='Processing queued...'
+        )
+    
+    def _get_or_create_state(self, video_id: str) -> ProgressState:
+        """
+        Get a video's state, starting tracking if it isn't tracked yet.
+        
+        The video is marked as most recently updated.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            ProgressState: Stored state for the video
+        """
+        with self._lock:
+            data = self.progress_data.get(video_id)
+            if data is None:
+                data = self.progress_data[video_id] = self._new_state()
+            self._touch(video_id)
+            return data
+    
+    def _touch(self, video_id: str) -> None:
+        """
+        Mark a video as most recently updated and evict beyond the size cap.
+        
+        Must be called with the lock held.
+        
+        Args:
+            video_id: YouTube video ID
+        """
+        self.progress_data.move_to_end(video_id)
+        while len(self.progress_data) > self.max_tracked:
+            evicted_id, _ = self.progress_data.popitem(last=False)
+            logger.debug(f"Evicted progress data for {evicted_id}")
     
-    def _create_progress_update(self, video_id: str) -> ProgressUpdate:
+    def _create_progress_update(self, video_id: str, data: ProgressState) -> ProgressUpdate:
         """
         Create a ProgressUpdate object from stored data.
         
         Args:
             video_id: YouTube video ID
+            data: Stored state for the video
             
         Returns:
             ProgressUpdate: Progress update object
         """
-        data = self.progress_data[video_id]
-        
         # Calculate estimated time remaining
-        elapsed = time.time() - data['start_time']
-        progress = data['progress_percent']
+        now = time.time()
+        elapsed = now - data.start_time
+        progress = data.progress_percent
         
         estimated_remaining = None
         if progress > 0 and progress < 100:
@@ -190,12 +267,12 @@ class ProgressTracker:
         
         return ProgressUpdate(
             video_id=video_id,
-            stage=data['stage'],
-            progress_percent=data['progress_percent'],
-            message=data['message'],
-            timestamp=datetime.now().isoformat(),
+            stage=data.stage,
+            progress_percent=data.progress_percent,
+            message=data.message,
+            timestamp=datetime.fromtimestamp(now).isoformat(),
             estimated_time_remaining=estimated_remaining,
-            error=data.get('error')
+            error=data.error
         )
     
     def cleanup(self, video_id: str) -> None:
@@ -205,8 +282,9 @@ class ProgressTracker:
         Args:
             video_id: YouTube video ID
         """
-        if video_id in self.progress_data:
-            del self.progress_data[video_id]
+        with self._lock:
+            removed = self.progress_data.pop(video_id, None)
+        if removed is not None:
             logger.info(f"Cleaned up progress data for {video_id}")
 
 
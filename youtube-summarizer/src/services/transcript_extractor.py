@@ -21,10 +21,12 @@ Key Features:
 import re
 import logging
 import requests
-import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from urllib.parse import urlparse, parse_qs
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.utils.ttl_cache import TTLCache
 
 # YouTube Transcript API for primary extraction method
 try:
@@ -57,6 +59,95 @@ except ImportError:
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Inline VTT cue tags (<00:00:00.480> timestamps and <c>/</c> spans) stripped
+# from every subtitle line, compiled once instead of per line
+VTT_TAG_PATTERN = re.compile(r'<[\d:.]+>|</?c>')
+
+# YouTube URL formats, tried in order by extract_video_id
+VIDEO_ID_PATTERNS = [
+    # Standard watch URLs: youtube.com/watch?v=VIDEO_ID
+    re.compile(r'(?:youtube\.com\/watch\?v=)([a-zA-Z0-9_-]{11})'),
+
+    # Short URLs: youtu.be/VIDEO_ID
+    re.compile(r'(?:youtu\.be\/)([a-zA-Z0-9_-]{11})'),
+
+    # Embed URLs: youtube.com/embed/VIDEO_ID
+    re.compile(r'(?:youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})'),
+
+    # Mobile URLs: m.youtube.com/watch?v=VIDEO_ID
+    re.compile(r'(?:m\.youtube\.com\/watch\?v=)([a-zA-Z0-9_-]{11})'),
+
+    # Handle URLs with additional parameters
+    re.compile(r'(?:youtube\.com\/watch\?.*v=)([a-zA-Z0-9_-]{11})'),
+]
+
+# Transcription artifacts like [Music] or (inaudible), removed in one pass
+TRANSCRIPT_ARTIFACT_PATTERN = re.compile(r'\[.*?\]|\(.*?\)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Caption text embedded in the watch page's JavaScript
+PAGE_TRANSCRIPT_TEXT_PATTERN = re.compile(r'"text":"([^"]+)"')
+
+# Keep-alive connections to YouTube reused across scraping requests
+HTTP_POOL_SIZE = 20
+HTTP_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+
+# Video titles remembered in-process so fallbacks don't refetch the watch page
+TITLE_CACHE_MAXSIZE = 1024
+TITLE_CACHE_TTL_SECONDS = 3600
+
+
+def _parse_vtt_lines(lines: Iterable[str]) -> str:
+    """
+    Join the caption text of a WebVTT subtitle file into one transcript.
+    
+    Cue timings, cue numbers, headers and metadata lines are skipped and
+    inline cue tags are stripped. Auto-generated captions roll each phrase
+    over several cues, so a line already contained at the end of the previous
+    one is dropped, and a line that extends the previous one replaces it.
+    Both checks compare whole words rather than characters.
+    
+    Args:
+        lines: Lines of the VTT file (e.g. an open file object)
+        
+    Returns:
+        str: Space-separated caption text
+    """
+    transcript_parts = []
+    previous = None
+    for line in lines:
+        line = line.strip()
+        # Skip empty lines, timestamps, metadata, and VTT headers
+        if (not line or
+                line.startswith('<') or
+                line.isdigit() or
+                '-->' in line or
+                'WEBVTT' in line or
+                'Kind:' in line or
+                'Language:' in line):
+            continue
+
+        # Remove VTT timestamp tags like <00:00:00.480>
+        clean_line = VTT_TAG_PATTERN.sub('', line).strip()
+        if not clean_line:
+            continue
+
+        # Compare whole words so e.g. "at" is not mistaken for the end of "cat"
+        tokens = clean_line.split()
+        if previous is not None:
+            if len(tokens) <= len(previous) and previous[-len(tokens):] == tokens:
+                continue
+            if tokens[:len(previous)] == previous:
+                transcript_parts[-1] = clean_line
+                previous = tokens
+                continue
+
+        transcript_parts.append(clean_line)
+        previous = tokens
+
+    return ' '.join(transcript_parts)
+
+
 class TranscriptExtractor:
     """
     YouTube transcript extraction service with multiple fallback methods.
@@ -83,8 +174,26 @@ class TranscriptExtractor:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
 
+        # Shared session so page fetches reuse pooled TCP/TLS connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=HTTP_RETRY
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Titles seen via yt-dlp or page scraping, keyed by video ID
+        self._titles = TTLCache(maxsize=TITLE_CACHE_MAXSIZE, ttl=TITLE_CACHE_TTL_SECONDS)
+
         logger.info(f"TranscriptExtractor initialized - yt-dlp: {YT_DLP_AVAILABLE}, API: {TRANSCRIPT_API_AVAILABLE}, Selenium: {SELENIUM_AVAILABLE}")
     
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self.session.close()
+    
     def extract_video_id(self, url: str) -> str:
         """
         Extract YouTube video ID from various URL formats.
@@ -108,27 +217,9 @@ class TranscriptExtractor:
         # Clean the URL and handle common variations
         url = url.strip()
         
-        # List of regex patterns for different YouTube URL formats
-        patterns = [
-            # Standard watch URLs: youtube.com/watch?v=VIDEO_ID
-            r'(?:youtube\.com\/watch\?v=)([a-zA-Z0-9_-]{11})',
-            
-            # Short URLs: youtu.be/VIDEO_ID
-            r'(?:youtu\.be\/)([a-zA-Z0-9_-]{11})',
-            
-            # Embed URLs: youtube.com/embed/VIDEO_ID
-            r'(?:youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-            
-            # Mobile URLs: m.youtube.com/watch?v=VIDEO_ID
-            r'(?:m\.youtube\.com\/watch\?v=)([a-zA-Z0-9_-]{11})',
-            
-            # Handle URLs with additional parameters
-            r'(?:youtube\.com\/watch\?.*v=)([a-zA-Z0-9_-]{11})',
-        ]
-        
         # Try each pattern until we find a match
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in VIDEO_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 video_id = match.group(1)
                 logger.info(f"Extracted video ID: {video_id} from URL: {url}")
@@ -321,58 +412,41 @@ class TranscriptExtractor:
             Exception: If yt-dlp extraction fails
         """
         url = f"https://www.youtube.com/watch?v={video_id}"
-        # Use a temporary file path for the subtitle
-        temp_subtitle_path_template = f"/tmp/{video_id}"
 
+        # Subtitles are fetched straight from the URL yt-dlp resolves, so nothing
+        # is written to disk and the video page is only extracted once
         ydl_opts = {
             'skip_download': True,
             'writeautomaticsub': True,
             'subtitleslangs': ['en'],
+            'subtitlesformat': 'vtt',
             'quiet': True,
             'no_warnings': True,
-            'outtmpl': temp_subtitle_path_template,
         }
 
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
                 title = info.get('title', f'Video {video_id}')
-
-                # Determine the path of the downloaded VTT file
-                subtitle_path = f"/tmp/{video_id}.en.vtt"
-                if not os.path.exists(subtitle_path):
-                    # If the file wasn't pre-downloaded, trigger download
-                    ydl.download([url])
-                    if not os.path.exists(subtitle_path):
-                        raise FileNotFoundError(f"VTT file not found for {video_id} after download attempt.")
-
-                # Parse the VTT file
-                with open(subtitle_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    transcript_parts = []
-                    for line in lines:
-                        line = line.strip()
-                        # Skip empty lines, timestamps, metadata, and VTT headers
-                        if (line and
-                            '-->' not in line and
-                            not line.isdigit() and
-                            'WEBVTT' not in line and
-                            'Kind:' not in line and
-                            'Language:' not in line and
-                            not line.startswith('<')):
-                            # Remove VTT timestamp tags like <00:00:00.480>
-                            import re
-                            clean_line = re.sub(r'<[\d:.]+>', '', line)
-                            clean_line = re.sub(r'<c>', '', clean_line)
-                            clean_line = re.sub(r'</c>', '', clean_line)
-                            if clean_line.strip():
-                                transcript_parts.append(clean_line.strip())
-
-                transcript = ' '.join(transcript_parts)
-
-                # Clean up the temporary file
-                if os.path.exists(subtitle_path):
-                    os.remove(subtitle_path)
+                # Kept even if caption extraction fails, for the API fallback
+                self._titles.set(video_id, info.get('title'))
+
+                requested = info.get('requested_subtitles') or {}
+                subtitle = requested.get('en')
+                if not subtitle:
+                    raise ValueError(f"No English subtitles available for {video_id}.")
+
+                # Parse the VTT captions
+                vtt_text = subtitle.get('data')
+                if vtt_text is None:
+                    response = self.session.get(
+                        subtitle['url'],
+                        headers=subtitle.get('http_headers'),
+                        timeout=15
+                    )
+                    response.raise_for_status()
+                    vtt_text = response.text
+                transcript = _parse_vtt_lines(vtt_text.splitlines())
 
                 if len(transcript) < 150:
                     raise ValueError(f"Transcript is too short ({len(transcript)} chars). Content may be insufficient for a quality summary.")
@@ -410,7 +484,7 @@ class TranscriptExtractor:
             url = f"https://www.youtube.com/watch?v={video_id}"
             
             # Make request to YouTube page
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             # Parse HTML content
@@ -611,9 +685,8 @@ class TranscriptExtractor:
             if "transcriptSegmentListRenderer" in page_source:
                 logger.info("Found transcript data in page source")
                 # Extract text between common patterns
-                import re
                 # This is a simplified extraction - real implementation would parse JSON
-                matches = re.findall(r'"text":"([^"]+)"', page_source)
+                matches = PAGE_TRANSCRIPT_TEXT_PATTERN.findall(page_source)
                 if matches:
                     return " ".join(matches)
 
@@ -629,6 +702,7 @@ class TranscriptExtractor:
         
         Uses web scraping to get video title from YouTube's page metadata.
         Fallback method when title is not available from transcript API.
+        Titles already seen by yt-dlp or an earlier lookup are reused.
         
         Args:
             video_id: YouTube video ID
@@ -636,9 +710,13 @@ class TranscriptExtractor:
         Returns:
             str: Video title or fallback if extraction fails
         """
+        cached_title = self._titles.get(video_id)
+        if cached_title:
+            return cached_title
+
         try:
             url = f"https://www.youtube.com/watch?v={video_id}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -656,6 +734,7 @@ class TranscriptExtractor:
                     if title:
                         # Clean up YouTube title formatting
                         title = title.replace(' - YouTube', '').strip()
+                        self._titles.set(video_id, title)
                         return title
             
             # Fallback if no title found
@@ -682,11 +761,10 @@ class TranscriptExtractor:
             return ""
         
         # Remove common transcript artifacts
-        text = re.sub(r'\[.*?\]', '', text)  # Remove [Music], [Applause], etc.
-        text = re.sub(r'\(.*?\)', '', text)  # Remove (inaudible), etc.
+        text = TRANSCRIPT_ARTIFACT_PATTERN.sub('', text)  # Remove [Music], (inaudible), etc.
         
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single space
+        text = WHITESPACE_PATTERN.sub(' ', text)  # Multiple spaces to single space
         text = text.strip()
         
         return text
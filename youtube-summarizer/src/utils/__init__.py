@@ -12,6 +12,8 @@ from .error_handler import (
     retry_with_backoff,
     handle_api_error
 )
+from .token_bucket import TokenBucket
+from .ttl_cache import TTLCache
 
 __all__ = [
     'VideoProcessingError',
@@ -21,6 +23,8 @@ __all__ = [
     'RateLimitError',
     'get_user_friendly_error',
     'retry_with_backoff',
-    'handle_api_error'
+    'handle_api_error',
+    'TokenBucket',
+    'TTLCache'
 ]
 
@@ -6,6 +6,7 @@ user-friendly error messages. Implements retry logic and error categorization.
 """
 
 import logging
+import random
 import time
 from typing import Callable, Any, Optional, Type
 from functools import wraps
@@ -36,7 +37,15 @@ class InvalidURLError(VideoProcessingError):
 
 class RateLimitError(VideoProcessingError):
     """Raised when API rate limit is exceeded."""
-    pass
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        """
+        Args:
+            message: Error message
+            retry_after: Seconds the API asked us to wait (Retry-After header), if any
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 def get_user_friendly_error(error: Exception) -> str:
@@ -83,16 +92,25 @@ def retry_with_backoff(
     max_retries: int = 3,
     initial_delay: float = 1.0,
     backoff_factor: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    max_delay: Optional[float] = None,
+    jitter: bool = False
 ) -> Callable:
     """
     Decorator for retrying functions with exponential backoff.
+
+    If the raised exception carries a ``retry_after`` attribute (e.g.
+    RateLimitError built from a Retry-After header), the wait is at
+    least that long.
     
     Args:
         max_retries: Maximum number of retry attempts
         initial_delay: Initial delay in seconds
         backoff_factor: Multiplier for delay after each retry
         exceptions: Tuple of exceptions to catch and retry on
+        max_delay: Upper bound on the backoff delay in seconds (no cap by default)
+        jitter: Randomize each wait between half and the full delay, so concurrent
+            callers that failed together don't retry in lockstep
         
     Returns:
         Decorated function that retries on failure
@@ -110,12 +128,18 @@ def retry_with_backoff(
                     last_exception = e
                     
                     if attempt < max_retries:
+                        wait = random.uniform(delay / 2, delay) if jitter else delay
+                        retry_after = getattr(e, "retry_after", None)
+                        if retry_after:
+                            wait = max(wait, retry_after)
                         logger.warning(
                             f"Attempt {attempt + 1}/{max_retries + 1} failed for {func.__name__}: {e}. "
-                            f"Retrying in {delay}s..."
+                            f"Retrying in {wait:.1f}s..."
                         )
-                        time.sleep(delay)
+                        time.sleep(wait)
                         delay *= backoff_factor
+                        if max_delay is not None:
+                            delay = min(delay, max_delay)
                     else:
                         logger.error(
                             f"All {max_retries + 1} attempts failed for {func.__name__}: {e}"
@@ -0,0 +1,103 @@
+"""
+JSON Provider - orjson-backed JSON encoding for Flask responses
+
+API responses carry full summaries and transcripts, so encoding them is the
+largest JSON cost per request. This provider serializes responses with orjson
+while keeping Flask's output conventions (sorted keys, HTTP dates, fallback
+encoding of types orjson doesn't handle). A matching json module replacement
+is provided for Socket.IO packets, which carry the progress updates.
+"""
+
+from typing import Any, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional - without it Flask's default provider is used
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes and decodes with orjson.
+
+    Pretty-printed output (debug mode, or an explicit indent) is left to the
+    default provider, since orjson only supports a fixed two-space indent.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON.
+
+        Args:
+            obj: Data to serialize
+            **kwargs: json.dumps-style options (indent, sort_keys, default)
+
+        Returns:
+            str: JSON document
+        """
+        # Compact output (the default outside debug mode) matches orjson's
+        if kwargs.get("indent") is not None:
+            return super().dumps(obj, **kwargs)
+
+        # Dates go through Flask's default (HTTP date strings), not orjson's ISO format
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """
+        Deserialize data as JSON.
+
+        Args:
+            s: JSON document
+            **kwargs: json.loads-style options (handled by the default provider)
+
+        Returns:
+            Parsed data
+        """
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+class OrjsonPacketJSON:
+    """
+    Stand-in for the json module when encoding Socket.IO packets.
+
+    Socket.IO only needs dumps/loads and always asks for compact output, which
+    is orjson's only format. Unlike passing flask.json, this doesn't push an app
+    context for every packet.
+    """
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize a packet payload as compact JSON.
+
+        Args:
+            obj: Data to serialize
+            **kwargs: json.dumps-style options (ignored; output is always compact)
+
+        Returns:
+            str: JSON document
+        """
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    @staticmethod
+    def loads(s: Union[str, bytes], **kwargs: Any) -> Any:
+        """
+        Deserialize a packet payload.
+
+        Args:
+            s: JSON document
+            **kwargs: json.loads-style options (ignored)
+
+        Returns:
+            Parsed data
+        """
+        return orjson.loads(s)
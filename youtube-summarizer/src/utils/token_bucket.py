@@ -0,0 +1,71 @@
+"""
+Token Bucket - Client-side request rate limiting for external APIs
+
+This module provides a thread-safe token bucket used to keep outgoing AI API
+requests under the provider's requests-per-minute quota. Concurrent callers
+(e.g. parallel chunk summarization) share one bucket, so bursts are smoothed
+out locally instead of being rejected by the API with 429 errors.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at rate_per_minute / 60 per second, up to
+    capacity. acquire() blocks until enough tokens are available.
+
+    Args:
+        rate_per_minute: Sustained number of operations allowed per minute
+        capacity: Maximum burst size (defaults to one second's worth, minimum 1)
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate_per_minute: Sustained number of operations allowed per minute
+            capacity: Maximum burst size (defaults to one second's worth, minimum 1)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, waiting for them to refill if necessary.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            float: Total seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    if waited:
+                        logger.debug(f"Rate limiter delayed request by {waited:.2f}s")
+                    return waited
+
+                wait = (tokens - self._tokens) / self.rate
+
+            # Sleep outside the lock so other callers can refill/check meanwhile
+            time.sleep(wait)
+            waited += wait
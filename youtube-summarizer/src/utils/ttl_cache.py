@@ -0,0 +1,93 @@
+"""
+TTL Cache - Small in-process LRU cache with per-entry expiry
+
+This module provides a thread-safe, size-bounded LRU cache whose entries
+expire after a fixed time. CacheManager uses it as an in-process tier in
+front of Redis, so a video requested repeatedly by the same worker is served
+without a network round trip.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a fixed time-to-live per entry.
+
+    When full, the least recently used entry is evicted. Expired entries are
+    dropped lazily when they are looked up or reach the LRU end.
+
+    Args:
+        maxsize: Maximum number of entries
+        ttl: Seconds an entry stays valid after it is stored
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid after it is stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up an entry, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used ones if full.
+
+        Args:
+            key: Cache key
+            value: Value to store (None is not cached)
+        """
+        if value is None or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -9,14 +9,12 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from src.services.ai_summarizer import AISummarizer
+from src.services.ai_summarizer import AISummarizer, _parse_timestamp
 
 def test_parse_timestamp():
     """Test timestamp parsing function"""
     print("\n=== Testing _parse_timestamp() ===")
     
-    summarizer = AISummarizer()
-    
     test_cases = [
         ("00:00", 0.0),
         ("01:30", 90.0),
@@ -27,7 +25,7 @@ def test_parse_timestamp():
     
     for timestamp_str, expected in test_cases:
         try:
-            result = summarizer._parse_timestamp(timestamp_str)
+            result = _parse_timestamp(timestamp_str)
             status = "✅" if result == expected else "❌"
             print(f"{status} {timestamp_str} -> {result} (expected: {expected})")
         except Exception as e:
@@ -185,3 +185,26 @@ class TestProcessVideoEndpoint:
         mock_transcript.assert_not_called()
         mock_summary.assert_not_called()
 
+
+
+class TestJSONProvider:
+    """Tests for the orjson-backed JSON responses."""
+
+    def test_responses_keep_flask_json_conventions(self, client):
+        """Test that responses stay compact, key-sorted, and use HTTP dates."""
+        from datetime import datetime
+
+        with app.app_context():
+            response = app.json.response({"b": 1, "a": datetime(2024, 1, 1)})
+
+        assert response.get_data(as_text=True).strip() == '{"a":"Mon, 01 Jan 2024 00:00:00 GMT","b":1}'
+
+    def test_socketio_packets_round_trip(self):
+        """Test that progress update packets encode compactly and decode back."""
+        from src.utils.json_provider import OrjsonPacketJSON
+
+        data = ["progress_update", {"video_id": "abc", "progress_percent": 40, "error": None}]
+        encoded = OrjsonPacketJSON.dumps(data, separators=(',', ':'))
+
+        assert encoded == '["progress_update",{"video_id":"abc","progress_percent":40,"error":null}]'
+        assert OrjsonPacketJSON.loads(encoded) == data
@@ -158,6 +158,12 @@ class TestExtractExecutiveSummary:
         result = extractor._extract_executive_summary("Short text")
         assert len(result) > 0
 
+    def test_overview_stops_at_next_heading(self, extractor):
+        """Test that the Overview section ends at the next heading."""
+        summary = "## Overview\n\n  Short intro!  \n## Details\nNot part of it."
+        result = extractor._extract_executive_summary(summary)
+        assert result == "Short intro"
+
     def test_summary_without_overview(self, extractor):
         """Test summary without Overview section."""
         summary = "Some content without overview section"
@@ -205,6 +211,17 @@ class TestExtractKeyMetrics:
         assert len(result) > 0
         assert any(m['type'] == 'numeric' for m in result)
 
+    def test_long_digit_run(self, extractor):
+        """Test that long digit runs are scanned without runaway backtracking."""
+        summary = "1" * 20000 + " and 7%"
+        result = extractor._extract_key_metrics(summary)
+        assert [m['value'] for m in result] == ["7%"]
+
+    def test_date_not_matched_inside_year(self, extractor):
+        """Test that an ISO date is not misread as a day/month/year date."""
+        result = extractor._extract_key_metrics("Released 2024-12-31")
+        assert all(m['type'] != 'date' for m in result)
+
     def test_no_metrics(self, extractor):
         """Test with summary containing no metrics."""
         summary = "This is a summary with no numbers or percentages"
@@ -219,12 +236,36 @@ class TestExtractKeyMetrics:
         values = [m['value'] for m in result]
         assert len(values) == len(set(values))
 
+    def test_overlapping_metric_matched_once(self, extractor):
+        """Test that a measurement is not also reported as a large number."""
+        summary = "The workout takes 5 minutes"
+        result = extractor._extract_key_metrics(summary)
+        assert [(m['value'], m['type']) for m in result] == [("5 minutes", "measurement")]
+
+    def test_metrics_ordered_by_type(self, extractor):
+        """Test that percentages are reported before later metric types."""
+        summary = "It costs $20 and 30% of users pay"
+        result = extractor._extract_key_metrics(summary)
+        assert [m['type'] for m in result] == ["percentage", "currency"]
+
+    def test_same_number_different_types(self, extractor):
+        """Test that equal numbers of different metric types are both kept."""
+        summary = "Fees rose 5% to $5 per seat"
+        result = extractor._extract_key_metrics(summary)
+        assert [m['value'] for m in result] == ["5%", "$5"]
+
     def test_max_five_metrics(self, extractor):
         """Test that only top 5 metrics are returned."""
         summary = "1% 2% 3% 4% 5% 6% 7% 8% 9% 10%"
         result = extractor._extract_key_metrics(summary)
         assert len(result) <= 5
 
+    def test_five_percentages_skip_later_metrics(self, extractor):
+        """Test that five percentages are reported ahead of later metric types."""
+        summary = "1% 2% 3% 4% 5% then $100 and 10 km"
+        result = extractor._extract_key_metrics(summary)
+        assert [m['value'] for m in result] == ["1%", "2%", "3%", "4%", "5%"]
+
 
 class TestExtractKeyPoints:
     """Test key points extraction."""
@@ -252,6 +293,18 @@ class TestExtractKeyPoints:
         result = extractor._extract_key_points(summary)
         assert len(result) <= 5
 
+    def test_bullets_do_not_span_lines(self, extractor):
+        """Test that a bare marker doesn't pull the next line in as a bullet."""
+        summary = "-\nNot a bullet point at all\n\n  * Indented bullet point"
+        result = extractor._extract_key_points(summary)
+        assert result == ["Indented bullet point"]
+
+    def test_many_blank_lines(self, extractor):
+        """Test that runs of whitespace-only lines are scanned without backtracking blowup."""
+        summary = "   \n" * 20000 + "- A real bullet point"
+        result = extractor._extract_key_points(summary)
+        assert result == ["A real bullet point"]
+
 
 class TestExtractActionItems:
     """Test action items extraction."""
@@ -261,6 +314,12 @@ class TestExtractActionItems:
         result = extractor._extract_action_items(sample_educational_summary)
         assert len(result) > 0
     
+    def test_action_section_stops_at_next_heading(self, extractor):
+        """Test that bullets after the Action Items section are not included."""
+        summary = "## Action Items\n- Learn C# basics\n- Ship it\n## Timestamps\n- 1:00 - Intro"
+        result = extractor._extract_action_items(summary)
+        assert result == ["Learn C# basics", "Ship it"]
+
     def test_fallback_to_imperative_verbs(self, extractor):
         """Test fallback to imperative verbs."""
         summary = "Review your portfolio. Consider defensive positions. Monitor the market."
@@ -296,6 +355,15 @@ class TestExtractTimestamps:
         result = extractor._extract_timestamps(summary)
         assert result == []
 
+    def test_timestamp_importance(self, extractor):
+        """Test that importance keywords near a timestamp mark it as high."""
+        result = extractor._extract_timestamps("3:10 - A CRITICAL step. Then more")
+        assert result[0]['importance'] == "high"
+        assert result[0]['key_point'] == "3:10 - A CRITICAL step"
+
+        result = extractor._extract_timestamps("4:20 - Setup")
+        assert result[0]['importance'] == "medium"
+
     def test_max_ten_timestamps(self, extractor):
         """Test that only top 10 timestamps are returned."""
         summary = "\n".join([f"{i}:00 - Point {i}" for i in range(15)])
@@ -13,11 +13,24 @@ Model: Gemini 2.5 Flash-Lite
 - API Key: GOOGLE_AI_API_KEY or GEMINI_API_KEY environment variable
 """
 
+import json
+import time
 import pytest
+import redis
 from unittest.mock import Mock, patch, MagicMock
-from src.services.transcript_extractor import TranscriptExtractor
-from src.services.ai_summarizer import AISummarizer
+from src.services.transcript_extractor import TranscriptExtractor, _parse_vtt_lines
+from src.services.ai_summarizer import (
+    AISummarizer,
+    QuickSummary,
+    _generate_gemini_text,
+    _get_gemini_model,
+    _get_openai_batch,
+    _parse_timestamp
+)
 from src.services.cache_manager import CacheManager
+from src.services.chat_service import ChatService
+from src.services.progress_tracker import ProcessingStage, ProgressTracker
+from src.utils.ttl_cache import TTLCache
 
 
 class TestTranscriptExtractor:
@@ -72,6 +85,61 @@ class TestTranscriptExtractor:
         assert "(inaudible)" not in clean_text
         assert "  " not in clean_text  # No double spaces
 
+    def test_parse_vtt_skips_metadata_and_rolling_repeats(self):
+        """Test that VTT parsing keeps caption text once per phrase."""
+        vtt = (
+            "WEBVTT\nKind: captions\nLanguage: en\n\n"
+            "1\n00:00:00.000 --> 00:00:02.000\nhello<00:00:00.480><c> world</c>\n\n"
+            "2\n00:00:02.000 --> 00:00:04.000\nhello world\nthis is a test\n"
+        )
+        assert _parse_vtt_lines(vtt.splitlines()) == "hello world this is a test"
+
+    def test_parse_vtt_merges_growing_captions(self):
+        """Test that a caption extending the previous one replaces it instead of repeating it."""
+        lines = ["so today we", "so today we are going", "going", "to learn Python"]
+        assert _parse_vtt_lines(lines) == "so today we are going to learn Python"
+        # Overlap is matched on whole words, not characters
+        assert _parse_vtt_lines(["I", "It was great"]) == "I It was great"
+        assert _parse_vtt_lines(["look at the cat", "at"]) == "look at the cat at"
+
+    def test_ytdlp_reads_subtitles_without_temp_files(self, extractor):
+        """Test that yt-dlp captions are fetched from the resolved URL, not a /tmp file."""
+        caption = "a sentence long enough to count as real spoken transcript content " * 3
+        ydl = MagicMock()
+        ydl.__enter__.return_value = ydl
+        ydl.extract_info.return_value = {
+            'title': 'My Video',
+            'requested_subtitles': {'en': {'ext': 'vtt', 'url': 'https://example.com/en.vtt'}}
+        }
+        response = Mock(text=f"WEBVTT\n\n00:00:00.000 --> 00:00:02.000\n{caption}\n")
+
+        with patch('src.services.transcript_extractor.yt_dlp.YoutubeDL', return_value=ydl), \
+                patch.object(extractor.session, 'get', return_value=response) as mock_get:
+            result = extractor._extract_with_ytdlp("dQw4w9WgXcQ")
+
+        assert result['title'] == 'My Video'
+        assert result['transcript'] == caption.strip()
+        assert mock_get.call_args[0][0] == 'https://example.com/en.vtt'
+        ydl.download.assert_not_called()
+
+        # The API fallback reuses the title yt-dlp already extracted
+        with patch.object(extractor.session, 'get') as mock_page_get:
+            assert extractor._get_video_title("dQw4w9WgXcQ") == 'My Video'
+        mock_page_get.assert_not_called()
+
+    def test_page_requests_reuse_session(self, extractor):
+        """Test that YouTube page fetches go through the pooled session and titles are reused."""
+        response = Mock()
+        response.content = b'<html><head><meta property="og:title" content="My Video - YouTube"></head></html>'
+
+        with patch.object(extractor.session, 'get', return_value=response) as mock_get:
+            assert extractor._get_video_title("dQw4w9WgXcQ") == "My Video"
+            assert extractor._get_video_title("dQw4w9WgXcQ") == "My Video"
+
+        assert mock_get.call_count == 1
+        assert extractor.session.headers['User-Agent'] == extractor.headers['User-Agent']
+        extractor.close()
+
 
 class TestAISummarizer:
     """
@@ -107,6 +175,23 @@ class TestAISummarizer:
         assert summarizer.mode_configs["quick"]["chunking_threshold"] >= 400
         assert summarizer.mode_configs["indepth"]["chunking_threshold"] >= 400
 
+    def test_mode_configs_define_response_schema(self, summarizer):
+        """Test that each mode requests structured output with its own schema."""
+        quick_schema = summarizer.mode_configs["quick"]["response_schema"]
+        indepth_schema = summarizer.mode_configs["indepth"]["response_schema"]
+
+        assert "full_summary" in quick_schema.__required_keys__
+        assert "key_quotes" not in quick_schema.__required_keys__
+        assert "key_quotes" in indepth_schema.__required_keys__
+
+    def test_mode_prompts_keep_dynamic_content_out_of_system_instruction(self, summarizer):
+        """Test that only the request template varies per video, so the system prefix is cacheable."""
+        for config in summarizer.mode_configs.values():
+            for placeholder in ("{transcript}", "{title}", "{tone}"):
+                assert placeholder not in config["system_instruction"]
+            request = config["request_template"].format(transcript="TRANSCRIPT", title="TITLE", tone="Casual")
+            assert "TRANSCRIPT" in request and "TITLE" in request and "Casual" in request
+
     def test_empty_transcript_raises_error(self, summarizer):
         """Test that empty transcript raises ValueError."""
         with pytest.raises(ValueError):
@@ -126,7 +211,7 @@ class TestAISummarizer:
         }
 
         # Setup mock cache
-        mock_cache.generate_content_hash.return_value = "hash123"
+        mock_cache.generate_content_hash_streaming.return_value = "hash123"
         mock_cache.get_cached_summary.return_value = cached_summary
 
         result = summarizer.generate_comprehensive_summary(transcript, title)
@@ -134,6 +219,345 @@ class TestAISummarizer:
         assert result == cached_summary
         mock_cache.get_cached_summary.assert_called_once()
 
+    def test_near_duplicate_cache_hit(self, summarizer, mock_cache):
+        """Test that a near-duplicate cache entry is used after an exact miss."""
+        cached_summary = {"quick_takeaway": "Test takeaway", "key_points": []}
+
+        mock_cache.generate_content_hash_streaming.side_effect = ["exact", "near"]
+        mock_cache.get_cached_summary.side_effect = [None, cached_summary]
+
+        result = summarizer.generate_comprehensive_summary("This is a test transcript", "Test Video")
+
+        assert result == cached_summary
+        assert mock_cache.get_cached_summary.call_count == 2
+
+    def test_cache_miss_stores_summary_in_background(self, summarizer, mock_cache):
+        """Test that a generated summary is written under both cache keys off the request path."""
+        summary = {"quick_takeaway": "Generated", "key_points": []}
+
+        mock_cache.generate_content_hash_streaming.side_effect = ["exact", "near"]
+        mock_cache.get_cached_summary.return_value = None
+
+        with patch.object(summarizer, '_summarize_single_pass', return_value=summary):
+            result = summarizer.generate_comprehensive_summary("This is a test transcript", "Test Video")
+        summarizer._cache_writer.shutdown(wait=True)
+
+        assert result == summary
+        mock_cache.cache_summaries.assert_called_once()
+        assert mock_cache.cache_summaries.call_args.args[0] == ("exact", "near")
+
+    def test_cached_summary_unaffected_by_caller_mutation(self, summarizer, mock_cache):
+        """Test that changes the caller makes to the returned summary don't leak into the cache."""
+        summary = {"quick_takeaway": "Generated", "key_points": []}
+
+        mock_cache.generate_content_hash_streaming.side_effect = ["exact", "near"]
+        mock_cache.get_cached_summary.return_value = None
+
+        with patch.object(summarizer, '_summarize_single_pass', return_value=summary):
+            result = summarizer.generate_comprehensive_summary("This is a test transcript", "Test Video")
+        result['_metadata'] = {"video_id": "abc"}
+        summarizer._cache_writer.shutdown(wait=True)
+
+        stored = mock_cache.cache_summaries.call_args.args[1]
+        assert json.loads(stored) == {"quick_takeaway": "Generated", "key_points": []}
+
+    def test_over_budget_transcript_is_chunked_not_truncated(self, summarizer):
+        """Test that a transcript over the input budget is chunked even when its duration estimate is short."""
+        summarizer.cache = None
+        # Few spaces (like CJK text): tiny duration estimate, but over the token budget
+        transcript = "字" * 400
+
+        with patch.object(summarizer, '_exceeds_input_budget', return_value=True), \
+                patch.object(summarizer, '_summarize_in_chunks', return_value={"chunked": True}) as mock_chunks, \
+                patch.object(summarizer, '_summarize_single_pass') as mock_single:
+            result = summarizer.generate_comprehensive_summary(transcript, "Test Video")
+
+        assert result == {"chunked": True}
+        mock_chunks.assert_called_once()
+        mock_single.assert_not_called()
+
+    def test_exceeds_input_budget(self, summarizer):
+        """Test the input budget check against real token counts."""
+        encoding = Mock()
+        encoding.encode.side_effect = lambda text, disallowed_special: [0] * len(text)
+
+        with patch('src.services.ai_summarizer.MAX_INPUT_TOKENS', 100), \
+                patch('src.services.ai_summarizer._get_token_encoding', return_value=encoding):
+            assert summarizer._exceeds_input_budget("字" * 20) is False
+            assert summarizer._exceeds_input_budget("字" * 101) is True
+
+    def test_near_duplicate_hash_ignores_punctuation_and_case(self):
+        """Test that cosmetic caption differences map to the same near-duplicate key."""
+        summarizer = AISummarizer(CacheManager(None))
+        args = ("Test Video", "quick", "00:00", "end", "Objective")
+
+        hash1 = summarizer._near_duplicate_hash("Hello, world. This is  a test!", *args)
+        hash2 = summarizer._near_duplicate_hash("hello world this is a test", *args)
+
+        assert hash1 == hash2
+
+    def test_chunked_summary_uses_map_and_reduce_models(self, summarizer):
+        """Test that chunk summaries use the map model and the final pass the reduce model."""
+        config = {**summarizer.mode_configs["quick"], "chunk_size": 5}
+        summarizer._splitters = {}
+
+        def summarize_batch(batch, title, total_chunks, model_name):
+            return [f"Part {i + 1}/{total_chunks}" for i, _ in batch]
+
+        with patch('src.services.ai_summarizer.CHUNK_BATCH_SIZE', 2), \
+                patch('src.services.ai_summarizer._get_token_encoding', return_value=None), \
+                patch.object(summarizer, '_summarize_chunk_batch', side_effect=summarize_batch) as mock_batch, \
+                patch.object(summarizer, '_summarize_single_pass', return_value={}) as mock_single:
+            summarizer._summarize_in_chunks("word " * 12, "Test Video", "quick", config)
+
+        assert mock_batch.call_count == 2
+        assert all(c.kwargs["model_name"] == config["map_model"] for c in mock_batch.call_args_list)
+        assert mock_single.call_args.kwargs["model_name"] == config["reduce_model"]
+        # Concurrent batch summaries are reassembled in original chunk order
+        meta_transcript = mock_single.call_args.args[0]
+        assert meta_transcript.index("Part 1/3") < meta_transcript.index("Part 2/3") < meta_transcript.index("Part 3/3")
+
+    def test_single_chunk_skips_map_step(self, summarizer):
+        """Test that a transcript that splits into one chunk is summarized in a single call."""
+        config = summarizer.mode_configs["quick"]
+        summarizer._splitters = {}
+
+        with patch('src.services.ai_summarizer._get_token_encoding', return_value=None), \
+                patch.object(summarizer, '_summarize_chunk_batch') as mock_batch, \
+                patch.object(summarizer, '_summarize_single_pass', return_value={}) as mock_single:
+            summarizer._summarize_in_chunks("word " * 12, "Test Video", "quick", config)
+
+        mock_batch.assert_not_called()
+        assert mock_single.call_args.args[0] == "word " * 12
+
+    def test_batch_priority_queues_summary_instead_of_blocking(self, summarizer, mock_cache):
+        """Test that a batch-priority cache miss is queued with submit_summary_batch, not summarized now."""
+        mock_cache.get_cached_summary.return_value = None
+
+        with patch.object(summarizer, 'submit_summary_batch', return_value="batch-1") as mock_submit, \
+                patch.object(summarizer, '_summarize_single_pass') as mock_single:
+            result = summarizer.generate_comprehensive_summary(
+                "This is a test transcript", "Test Video", priority="batch"
+            )
+
+        assert result is None
+        mock_submit.assert_called_once_with(
+            [{"transcript": "This is a test transcript", "title": "Test Video"}], "quick", "Objective"
+        )
+        mock_single.assert_not_called()
+
+    def test_chunk_batch_scatters_summaries_and_fills_gaps(self, summarizer, monkeypatch):
+        """Test that batched chunk summaries map back by id and missing ones are summarized alone."""
+        monkeypatch.setenv("GOOGLE_AI_API_KEY", "test-key")
+        summarizer.cache.get_cached_chunk_summary.return_value = None
+        response = MagicMock()
+        response.candidates[0].content.parts[0].text = json.dumps(
+            {"summaries": [{"id": 3, "text": "third"}, {"id": 1, "text": "first"}]}
+        )
+
+        _get_gemini_model.cache_clear()
+        with patch('src.services.ai_summarizer._configure_gemini'), \
+                patch('src.services.ai_summarizer.genai.GenerativeModel') as mock_model, \
+                patch.object(summarizer, '_summarize_chunk', return_value="second") as mock_chunk:
+            mock_model.return_value.generate_content.return_value = response
+            result = summarizer._summarize_chunk_batch([(0, "a"), (1, "b"), (2, "c")], "Test Video", 3)
+        _get_gemini_model.cache_clear()
+
+        assert result == ["first", "second", "third"]
+        mock_chunk.assert_called_once()
+
+    def test_gemini_models_are_built_once_per_config(self, monkeypatch):
+        """Test that repeated requests with the same settings reuse one GenerativeModel."""
+        monkeypatch.setenv("GOOGLE_AI_API_KEY", "test-key")
+        response = MagicMock()
+        response.candidates[0].content.parts[0].text = " ok "
+        config = {"temperature": 0.3, "response_schema": QuickSummary}
+
+        _get_gemini_model.cache_clear()
+        with patch('src.services.ai_summarizer._configure_gemini'), \
+                patch('src.services.ai_summarizer.genai.GenerativeModel') as mock_model:
+            mock_model.return_value.generate_content.return_value = response
+            for prompt in ("first", "second"):
+                assert _generate_gemini_text(prompt, "model", dict(config), "system", timeout=10) == "ok"
+        _get_gemini_model.cache_clear()
+
+        mock_model.assert_called_once()
+        assert mock_model.return_value.generate_content.call_count == 2
+
+    def test_chunk_batch_skips_cached_chunks(self, summarizer, mock_cache):
+        """Test that chunks with cached summaries are not sent to the API."""
+        mock_cache.generate_content_hash_streaming.side_effect = lambda parts: parts[-1]
+        mock_cache.get_cached_chunk_summary.side_effect = lambda key: {"a": "cached a"}.get(key)
+
+        with patch.object(summarizer, '_summarize_chunk', return_value="fresh b") as mock_chunk:
+            result = summarizer._summarize_chunk_batch([(0, "a"), (1, "b")], "Test Video", 2)
+
+        assert result == ["cached a", "fresh b"]
+        mock_chunk.assert_called_once()
+
+    def test_parse_timestamp(self):
+        """Test MM:SS, HH:MM:SS and "end" timestamp parsing."""
+        assert _parse_timestamp("05:30") == 330
+        assert _parse_timestamp("1:02:03") == 3723
+        assert _parse_timestamp("End") == -1
+        with pytest.raises(ValueError):
+            _parse_timestamp("1:2:3:4")
+        with pytest.raises(ValueError):
+            _parse_timestamp("aa:bb")
+
+    def test_batch_api_requests_retry_rate_limits(self, monkeypatch):
+        """Test that a 429 from the Batch API is retried after Retry-After instead of failing the batch."""
+        limited = Mock(status_code=429, headers={"retry-after": "3"})
+        ok = Mock(status_code=200, headers={})
+        ok.json.return_value = {"id": "batch-1", "status": "in_progress"}
+
+        with patch('src.services.ai_summarizer._openai_client') as client, \
+                patch('src.utils.error_handler.time.sleep') as mock_sleep:
+            client.request.side_effect = [limited, ok]
+            batch = _get_openai_batch("batch-1", {})
+
+        assert batch["status"] == "in_progress"
+        assert client.request.call_count == 2
+        assert mock_sleep.call_args.args[0] >= 3
+
+    def test_generate_summaries_keeps_input_order(self, summarizer):
+        """Test that concurrent multi-video summaries come back in input order, with failures as None."""
+        def fake_summary(transcript, title, mode, tone):
+            if title == "Broken":
+                raise ValueError("Transcript cannot be empty")
+            return {"quick_takeaway": title}
+
+        videos = [{"transcript": "a", "title": "One"}, {"transcript": "", "title": "Broken"}, {"transcript": "c", "title": "Three"}]
+        with patch.object(summarizer, 'generate_comprehensive_summary', side_effect=fake_summary):
+            results = summarizer.generate_summaries(videos)
+
+        assert results == [{"quick_takeaway": "One"}, None, {"quick_takeaway": "Three"}]
+
+    def test_submit_summary_batch_skips_cached_videos(self, summarizer, mock_cache, monkeypatch):
+        """Test that only uncached videos are queued, keyed by their summary cache key."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        mock_cache.generate_content_hash_streaming.side_effect = lambda parts: str(hash(tuple(parts)))
+        mock_cache.get_cached_summaries.side_effect = lambda keys: {key: None if key == cached_key else {"cached": True} for key in keys}
+        videos = [{"transcript": "new video", "title": "New"}, {"transcript": "old video", "title": "Old"}]
+        cached_key = summarizer._summary_cache_key("new video", "New", "quick", "00:00", "end", "Objective")
+
+        with patch('src.services.ai_summarizer._openai_client') as client:
+            client.request.return_value.json.side_effect = [{"id": "file-1"}, {"id": "batch-1", "status": "validating"}]
+            batch_id = summarizer.submit_summary_batch(videos)
+
+        assert batch_id == "batch-1"
+        uploaded = client.request.call_args_list[0].kwargs["files"]["file"][1].decode().splitlines()
+        assert [json.loads(line)["custom_id"] for line in uploaded] == [cached_key]
+        metadata = mock_cache.cache_summary_batch.call_args[0][1]
+        assert metadata["mode"] == "quick" and list(metadata["keys"]) == [cached_key]
+
+    def test_collect_summary_batch_caches_valid_summaries(self, summarizer, mock_cache, monkeypatch):
+        """Test that finished batch results are validated and written to the summary cache."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        mock_cache.get_summary_batch.return_value = {"mode": "quick", "keys": {"good": "good-near", "bad": "bad-near"}}
+        valid = summarizer._get_fallback_summary("transcript", "Title")
+        output_lines = [
+            {"custom_id": "good", "response": {"body": {"choices": [{"message": {"content": json.dumps(valid)}}]}}},
+            {"custom_id": "bad", "response": {"body": {"choices": [{"message": {"content": "{}"}}]}}},
+        ]
+
+        with patch('src.services.ai_summarizer._openai_client') as client:
+            client.request.return_value.json.return_value = {"id": "batch-1", "status": "in_progress"}
+            assert summarizer.collect_summary_batch("batch-1") is None
+
+            client.request.return_value.json.return_value = {"id": "batch-1", "status": "completed", "output_file_id": "file-2"}
+            client.request.return_value.text = "\n".join(json.dumps(line) for line in output_lines)
+            assert summarizer.collect_summary_batch("batch-1") == 1
+
+        mock_cache.cache_summaries.assert_called_once()
+        assert mock_cache.cache_summaries.call_args.args[0] == ("good", "good-near")
+
+    def test_splitters_measure_tokens_when_tokenizer_available(self, mock_cache):
+        """Test that chunk splitters size chunks in tokens when an encoding is available."""
+        encoding = Mock()
+        encoding.encode.side_effect = lambda text, disallowed_special: text.split()
+
+        # LangChain is optional, so its classes are patched in rather than required
+        with patch('src.services.ai_summarizer._get_token_encoding', return_value=encoding), \
+                patch('src.services.ai_summarizer.LANGCHAIN_AVAILABLE', True), \
+                patch('src.services.ai_summarizer.PromptTemplate', create=True), \
+                patch('src.services.ai_summarizer.RecursiveCharacterTextSplitter', create=True) as mock_splitter:
+            summarizer = AISummarizer(mock_cache)
+
+        splitter_kwargs = mock_splitter.call_args_list[0].kwargs
+        assert splitter_kwargs["chunk_size"] == summarizer.mode_configs["quick"]["chunk_tokens"]
+        assert splitter_kwargs["length_function"]("one two three") == 3
+
+    def test_fit_to_input_budget_trims_by_tokens(self, summarizer):
+        """Test that over-budget transcripts are trimmed to exactly the token budget."""
+        encoding = Mock()
+        encoding.encode.side_effect = lambda text, disallowed_special: list(text)
+        encoding.decode.side_effect = lambda tokens: "".join(tokens)
+
+        with patch('src.services.ai_summarizer._get_token_encoding', return_value=encoding), \
+                patch('src.services.ai_summarizer.MAX_INPUT_TOKENS', 10):
+            short, _ = summarizer._fit_to_input_budget("ab")
+            trimmed, token_count = summarizer._fit_to_input_budget("abcdefghijklmnop")
+
+        assert short == "ab"
+        encoding.encode.assert_called_once()
+        assert trimmed.startswith("abcdefghij...")
+        assert token_count == 10
+
+    def test_split_transcript_by_word_count(self, summarizer):
+        """Test that word-count splitting yields chunks of chunk_size words covering the transcript."""
+        chunks = summarizer._split_transcript("one two three\nfour five six seven ", chunk_size=3)
+
+        assert chunks == ["one two three", "four five six", "seven"]
+
+    def test_words_per_chunk_fills_token_budget(self, summarizer):
+        """Test that fallback chunk sizes follow the transcript's measured token density."""
+        config = {**summarizer.mode_configs["quick"], "chunk_tokens": 100}
+        encoding = Mock()
+        encoding.encode.side_effect = lambda text, disallowed_special: [0] * (2 * len(text.split()))
+
+        with patch('src.services.ai_summarizer._get_token_encoding', return_value=encoding):
+            assert summarizer._words_per_chunk("word " * 500, config) == 50
+        with patch('src.services.ai_summarizer._get_token_encoding', return_value=None):
+            assert summarizer._words_per_chunk("word " * 500, config) == config["chunk_size"]
+
+    def test_split_transcript_snaps_to_sentence_breaks(self, summarizer):
+        """Test that word-count chunks end at a sentence break when one is near the cut."""
+        chunks = summarizer._split_transcript("One two three. Four five six seven eight", chunk_size=5)
+
+        assert chunks == ["One two three.", "Four five six seven eight"]
+
+    def test_merge_small_chunks(self, summarizer):
+        """Test that undersized chunk fragments are merged into the previous chunk."""
+        chunks = ["a" * 600, "b" * 600, "tail"]
+
+        merged = summarizer._merge_small_chunks(chunks)
+
+        assert len(merged) == 2
+        assert merged[-1].endswith(" tail")
+
+    def test_mode_validators_check_required_fields(self, summarizer):
+        """Test that per-mode validators enforce required fields and list types."""
+        quick = {
+            'quick_takeaway': 'x', 'key_points': [], 'topics': [],
+            'timestamps': [], 'full_summary': []
+        }
+
+        assert summarizer._validators['quick'](quick) is None
+        assert 'detailed_analysis' in summarizer._validators['indepth'](quick)
+        assert summarizer._validators['quick']({**quick, 'key_points': 'x'}) is not None
+
+    def test_single_pass_regenerates_invalid_response(self, summarizer):
+        """Test that a truncated response is regenerated once before falling back."""
+        valid = {"quick_takeaway": "T", "key_points": [], "topics": [], "timestamps": [], "full_summary": []}
+        config = summarizer.mode_configs["quick"]
+
+        with patch.object(summarizer, '_generate_with_gemini', side_effect=['{"quick_takeaway": "T', json.dumps(valid)]) as mock_generate:
+            result = summarizer._summarize_single_pass("transcript", "Test Video", "quick", config)
+
+        assert result == valid
+        assert mock_generate.call_count == 2
+
     def test_fallback_summary_structure(self, summarizer):
         """Test that fallback summary returns valid JSON structure."""
         transcript = "This is a test transcript for fallback"
@@ -149,6 +573,14 @@ class TestAISummarizer:
         assert isinstance(fallback["key_points"], list)
         assert isinstance(fallback["full_summary"], list)
 
+    def test_fallback_summary_truncates_long_transcript(self, summarizer):
+        """Test that the fallback summary keeps the first 300 words and marks truncation."""
+        short = summarizer._get_fallback_summary("word " * 300, "Test Video")
+        long = summarizer._get_fallback_summary("word " * 301, "Test Video")
+
+        assert short["full_summary"][0]["content"] == " ".join(["word"] * 300)
+        assert long["full_summary"][0]["content"].startswith(" ".join(["word"] * 300) + "...")
+
 
 class TestCacheManager:
     """Tests for CacheManager service."""
@@ -181,6 +613,46 @@ class TestCacheManager:
         # Hash should be 16 characters
         assert len(hash1) == 16
     
+    def test_generate_content_hash_streaming(self, cache_manager):
+        """Test streaming hash is deterministic and respects part boundaries."""
+        hash1 = cache_manager.generate_content_hash_streaming(("v1", "quick", "transcript"))
+        hash2 = cache_manager.generate_content_hash_streaming(("v1", "quick", "transcript"))
+        hash3 = cache_manager.generate_content_hash_streaming(("v1", "quicktr", "anscript"))
+
+        assert hash1 == hash2
+        assert hash1 != hash3
+        assert len(hash1) == 16
+
+    def test_generate_content_hash_streaming_slices_long_parts(self, cache_manager):
+        """Test that hashing a long part in slices gives the same digest as hashing it whole."""
+        transcript = "héllo wörld " * 10
+
+        with patch('src.services.cache_manager.HASH_ENCODE_BLOCK_CHARS', 7):
+            sliced = cache_manager.generate_content_hash_streaming(("v1", transcript))
+        whole = cache_manager.generate_content_hash_streaming(("v1", transcript))
+
+        assert sliced == whole
+
+    def test_get_cached_summaries_uses_one_mget(self, cache_manager, mock_redis):
+        """Test that bulk summary lookups issue a single MGET and keep input order."""
+        mock_redis.mget.return_value = ['{"quick_takeaway": "A"}', None, "legacy text"]
+
+        result = cache_manager.get_cached_summaries(["a", "b", "c"])
+
+        mock_redis.mget.assert_called_once_with(["summary:a", "summary:b", "summary:c"])
+        assert result == {"a": {"quick_takeaway": "A"}, "b": None, "c": "legacy text"}
+
+    def test_bulk_lookups_group_keys_by_slot_on_cluster(self):
+        """Test that bulk lookups on Redis Cluster use the slot-grouping MGET."""
+        cluster = Mock(spec=redis.RedisCluster)
+        cluster.mget_nonatomic.return_value = [None, '{"quick_takeaway": "B"}']
+
+        result = CacheManager(cluster).get_cached_summaries(["a", "b"])
+
+        cluster.mget_nonatomic.assert_called_once_with(["summary:a", "summary:b"])
+        cluster.mget.assert_not_called()
+        assert result == {"a": None, "b": {"quick_takeaway": "B"}}
+
     def test_cache_transcript(self, cache_manager, mock_redis):
         """Test caching transcript data."""
         video_id = "test123"
@@ -205,3 +677,231 @@ class TestCacheManager:
         assert result["transcript"] == "Test"
         assert result["title"] == "Test Video"
 
+
+    def test_cache_summary_serializes_json(self, cache_manager, mock_redis):
+        """Test that structured summaries are stored as JSON with the given TTL."""
+        summary = {"quick_takeaway": "Test", "key_points": ["Point 1"]}
+
+        mock_redis.setex.return_value = True
+
+        result = cache_manager.cache_summary("hash123", summary, ttl=60)
+
+        assert result is True
+        key, ttl, value = mock_redis.setex.call_args[0]
+        assert key == "summary:hash123"
+        assert ttl == 60
+        assert json.loads(value) == summary
+
+    def test_cache_summaries_uses_one_pipeline(self, cache_manager, mock_redis):
+        """Test that a summary stored under several keys is written in a single pipeline."""
+        summary = {"quick_takeaway": "Test", "key_points": []}
+        pipe = mock_redis.pipeline.return_value
+        pipe.execute.return_value = [True, True]
+
+        result = cache_manager.cache_summaries(("exact", "near"), summary, ttl=60)
+
+        assert result is True
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert [c.args[0] for c in pipe.setex.call_args_list] == ["summary:exact", "summary:near"]
+        pipe.execute.assert_called_once()
+
+    def test_large_transcripts_are_compressed(self, mock_redis):
+        """Test that large values are stored compressed and read back unchanged."""
+        cache_manager = CacheManager(mock_redis)
+        transcript_data = {"transcript": "word " * 2000, "title": "Test Video"}
+        mock_redis.setex.return_value = True
+
+        cache_manager.cache_transcript("test123", transcript_data)
+        stored = mock_redis.setex.call_args[0][2]
+        mock_redis.get.return_value = stored
+
+        assert stored.startswith("\x00") and len(stored) < len(json.dumps(transcript_data)) // 4
+        # A fresh manager has no in-process copy, so the value is read from Redis
+        assert CacheManager(mock_redis).get_cached_transcript("test123") == transcript_data
+
+    def test_repeat_summary_reads_skip_redis(self, cache_manager, mock_redis):
+        """Test that a summary read twice is served from the in-process tier the second time."""
+        mock_redis.get.return_value = '{"quick_takeaway": "Test", "key_points": []}'
+
+        first = cache_manager.get_cached_summary("hash123")
+        first["_metadata"] = {"cached": True}
+        second = cache_manager.get_cached_summary("hash123")
+
+        mock_redis.get.assert_called_once_with("summary:hash123")
+        assert second == {"quick_takeaway": "Test", "key_points": []}
+
+    def test_ttl_cache_evicts_least_recently_used_and_expired(self):
+        """Test the in-process tier's LRU eviction and expiry."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+
+        with patch('src.utils.ttl_cache.time.monotonic', return_value=time.monotonic() + 61):
+            assert cache.get("a") is None
+
+    def test_get_cached_summary_returns_dict(self, cache_manager, mock_redis):
+        """Test that cached JSON summaries are deserialized on retrieval."""
+        mock_redis.get.return_value = '{"quick_takeaway": "Test", "key_points": []}'
+
+        result = cache_manager.get_cached_summary("hash123")
+
+        assert result == {"quick_takeaway": "Test", "key_points": []}
+
+
+class TestChatService:
+    """Tests for ChatService request handling (no real API calls)."""
+
+    @pytest.fixture
+    def chat_service(self, monkeypatch):
+        """Create a ChatService with a dummy API key."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        return ChatService()
+
+    @staticmethod
+    def _response(status_code, headers=None):
+        response = Mock(status_code=status_code, headers=headers or {})
+        response.content = json.dumps({"choices": [{"message": {"content": " Answer "}}]}).encode()
+        response.json.return_value = json.loads(response.content)
+        return response
+
+    def test_truncate_transcript_to_token_budget(self, chat_service):
+        """Test that the transcript excerpt is cut at the token budget, tokenizing only a prefix."""
+        encoding = Mock()
+        encoding.encode.side_effect = lambda text, disallowed_special: text.split()
+        encoding.decode.side_effect = " ".join
+        transcript = "word " * 1000
+
+        with patch('src.services.chat_service._get_token_encoding', return_value=encoding):
+            excerpt, truncated = chat_service._truncate_transcript(transcript, max_tokens=10)
+            short, short_truncated = chat_service._truncate_transcript("a few words", max_tokens=10)
+
+        assert excerpt == " ".join(["word"] * 10) and truncated
+        assert len(encoding.encode.call_args_list[0].args[0]) == 10 * 8
+        assert short == "a few words" and not short_truncated
+
+    def test_recent_history_fits_token_budget(self, chat_service):
+        """Test that the oldest history messages are dropped once the token budget is spent."""
+        history = [
+            {"role": "user", "content": "x" * 400},
+            {"role": "assistant", "content": "y" * 40},
+            {"role": "user", "content": "z" * 40},
+        ]
+
+        with patch('src.services.chat_service._get_token_encoding', return_value=None):
+            kept = chat_service._recent_history(history, max_tokens=50)
+
+        assert kept == history[1:]
+
+    def test_retries_rate_limited_requests(self, chat_service):
+        """Test that 429 responses are retried, honoring Retry-After."""
+        responses = [self._response(429, {"retry-after": "2"}), self._response(200)]
+
+        with patch('src.services.chat_service._http_client.post', side_effect=responses) as mock_post, \
+                patch('src.utils.error_handler.time.sleep') as mock_sleep:
+            result = chat_service._call_openai([{"role": "user", "content": "Hi"}])
+
+        assert result == "Answer"
+        assert mock_post.call_count == 2
+        assert mock_sleep.call_args.args[0] >= 2
+
+    def test_chat_stream_yields_deltas(self, chat_service):
+        """Test that streamed SSE chunks are yielded as text fragments and the response is closed."""
+        events = [
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Hello"}}]},
+            {"choices": [{"delta": {"content": " there"}}]},
+        ]
+        response = Mock(status_code=200, headers={})
+        response.iter_lines.return_value = [f"data: {json.dumps(e)}" for e in events] + ["", "data: [DONE]"]
+
+        with patch('src.services.chat_service._http_client.send', return_value=response):
+            fragments = list(chat_service.chat_stream("Hi", "Video", {}, "transcript"))
+
+        assert fragments == ["Hello", " there"]
+        response.close.assert_called_once()
+
+    def test_chat_stream_validates_before_streaming(self, chat_service):
+        """Test that invalid messages are rejected before any request is made."""
+        with patch('src.services.chat_service._http_client.send') as mock_send:
+            with pytest.raises(ValueError):
+                chat_service.chat_stream("   ", "Video", {}, "transcript")
+
+        mock_send.assert_not_called()
+
+    def test_gives_up_after_repeated_rate_limits(self, chat_service):
+        """Test that persistent 429s surface as a RuntimeError after bounded retries."""
+        with patch('src.services.chat_service._http_client.post', return_value=self._response(429)) as mock_post, \
+                patch('src.utils.error_handler.time.sleep'):
+            with pytest.raises(RuntimeError):
+                chat_service._call_openai([{"role": "user", "content": "Hi"}])
+
+        assert mock_post.call_count == 5
+
+
+class TestProgressTracker:
+    """Tests for ProgressTracker service."""
+
+    def test_update_stage_reports_progress(self):
+        """Test that stage updates are reflected in progress reports."""
+        tracker = ProgressTracker()
+        tracker.start_processing("abc123")
+
+        update = tracker.update_stage("abc123", ProcessingStage.GENERATING_SUMMARY, "Summarizing")
+
+        assert update.stage == "generating_summary"
+        assert update.progress_percent == 80
+        assert update.message == "Summarizing"
+        assert update.error is None
+
+    def test_update_stage_starts_untracked_video(self):
+        """Test that updating an untracked video starts tracking it once."""
+        tracker = ProgressTracker()
+
+        tracker.update_stage("abc123", ProcessingStage.EXTRACTING_TRANSCRIPT, "Fetching")
+        state = tracker.progress_data["abc123"]
+        tracker.update_stage("abc123", ProcessingStage.GENERATING_SUMMARY, "Summarizing")
+
+        assert tracker.progress_data["abc123"] is state
+        assert state.stage == "generating_summary"
+
+    def test_fail_processing_records_error(self):
+        """Test that failures carry the error and reset progress."""
+        tracker = ProgressTracker()
+
+        update = tracker.fail_processing("abc123", "boom")
+
+        assert update.stage == "failed"
+        assert update.progress_percent == 0
+        assert update.error == "boom"
+        assert tracker.get_progress("abc123").to_dict()["error"] == "boom"
+
+    def test_progress_update_to_dict_matches_fields(self):
+        """Test that to_dict includes every ProgressUpdate field."""
+        from dataclasses import asdict
+        tracker = ProgressTracker()
+        update = tracker.update_stage("abc123", ProcessingStage.QUEUED, "Queued")
+
+        assert update.to_dict() == asdict(update)
+
+    def test_evicts_least_recently_updated(self):
+        """Test that tracked videos are capped, dropping the stalest first."""
+        tracker = ProgressTracker(max_tracked=2)
+        tracker.start_processing("a")
+        tracker.start_processing("b")
+        tracker.update_stage("a", ProcessingStage.GENERATING_SUMMARY, "Summarizing")
+        tracker.start_processing("c")
+
+        assert tracker.get_progress("b") is None
+        assert tracker.get_progress("a") is not None
+        assert tracker.get_progress("c") is not None
+
+    def test_cleanup_removes_state(self):
+        """Test that cleaned-up videos no longer report progress."""
+        tracker = ProgressTracker()
+        tracker.start_processing("abc123")
+        tracker.cleanup("abc123")
+
+        assert tracker.get_progress("abc123") is None